@@ -0,0 +1,321 @@
+
+############################################################
+# PARAMETERS - replace as appropriate
+############################################################
+
+# "What would the Contiguous list be if these Primary counties were designated?"
+# This answers that for MANY scenarios at once without making any maps:
+# the county adjacency (Select By Location INTERSECT on the counties-with-water layer)
+# and the distance check (WITHIN_A_DISTANCE_GEODESIC on the non-water layers) are worked out
+# ONE time and stored as sparse matrices; after that every scenario is just a row in a
+# scenario x county matrix, and all the Contiguous lists come out of one matrix product.
+
+# The project, layers and contiguous distance all come from the map automation script
+# (ArcGIS_Pro_Notebook_Map_Automation.py, which needs to sit in the same folder),
+# so the answers here match what the maps would show.
+
+# Where to keep the precomputed adjacency/distance matrices between runs.
+# They get rebuilt automatically if the county/tribal data or the distance change.
+
+graph_cache = r"C:\Users\misti.wudtke\OneDrive - USDA\PROJECTS\FSA_AutoMap_v3_100Automated\designation_graphs.npz"
+
+
+# When run as a script: an Excel file with one scenario per sheet
+# (codes in the first column, same layout as the map input files),
+# and the CSV file to write the results to.
+
+scenario_workbook = r"C:\Users\misti.wudtke\OneDrive - USDA\PROJECTS\FSA_AutoMap_v3_100Automated\What_If_Scenarios.xlsx"
+
+results_csv = r"C:\Users\misti.wudtke\OneDrive - USDA\PROJECTS\FSA_AutoMap_v3_100Automated\What_If_Results.csv"
+
+
+################################################################################
+# DO THE WORK
+################################################################################
+
+import arcpy
+import os
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+import ArcGIS_Pro_Notebook_Map_Automation as automation
+
+from ArcGIS_Pro_Notebook_Map_Automation import print_message
+
+############################################################
+
+# Run a one-to-many Spatial Join and send back every matching pair of codes
+# (target code, join code). match_option uses the same relationships as
+# Select By Location, so the pairs line up with what the map script selects.
+def spatial_pairs(target_layer, target_field, join_layer, join_field, match_option, search_radius=None):
+
+    # Codes for every feature in each layer, by ObjectID
+    target_codes = {oid: code for oid, code in arcpy.da.SearchCursor(target_layer, ["OID@", target_field])}
+    join_codes = {oid: code for oid, code in arcpy.da.SearchCursor(join_layer, ["OID@", join_field])}
+
+    pairs_table = r"memory\what_if_pairs"
+
+    arcpy.analysis.SpatialJoin(
+        target_layer, join_layer, pairs_table,
+        "JOIN_ONE_TO_MANY", "KEEP_COMMON",
+        match_option=match_option, search_radius=search_radius,
+    )
+
+    with arcpy.da.SearchCursor(pairs_table, ["TARGET_FID", "JOIN_FID"]) as search_cursor:
+        pairs = {(target_codes[t], join_codes[j]) for t, j in search_cursor}
+
+    arcpy.management.Delete(pairs_table)
+
+    return pairs
+
+
+############################################################
+
+# Turn a set of (row code, column code) pairs into a sparse 0/1 matrix
+def pairs_to_matrix(pairs, row_index, column_index):
+
+    pairs = [(row_index[r], column_index[c]) for r, c in pairs if r in row_index and c in column_index]
+    rows = np.array([p[0] for p in pairs], dtype=np.int64)
+    columns = np.array([p[1] for p in pairs], dtype=np.int64)
+
+    return sparse.csr_matrix(
+        (np.ones(len(pairs), dtype=np.int32), (rows, columns)),
+        shape=(len(row_index), len(column_index)),
+    )
+
+
+############################################################
+
+# Work out the adjacency and distance matrices from the layers in the map.
+# Rows/columns are counties (by FIPS_C) and tribal areas (by AIANNH);
+#   county_adjacent: county -> counties it touches (counties with water)
+#   tribal_adjacent: tribal area -> counties it touches (counties with water)
+#   county_near: county -> counties within the contiguous distance (non-water)
+#   tribal_near: tribal area -> counties within the contiguous distance (non-water)
+# This is the slow part (a few spatial joins over the whole country),
+# which is why the results get cached.
+def build_graphs(map_layers):
+
+    counties, tribal, water = map_layers
+
+    print_message("Building county adjacency and distance matrices (this takes a while)")
+
+    county_codes = sorted(
+        {row[0] for row in arcpy.da.SearchCursor(water, ["FIPS_C"])}
+        | {row[0] for row in arcpy.da.SearchCursor(counties, ["FIPS_C"])}
+    )
+    tribal_codes = sorted({row[0] for row in arcpy.da.SearchCursor(tribal, ["AIANNH"])})
+
+    county_index = {code: i for i, code in enumerate(county_codes)}
+    tribal_index = {code: i for i, code in enumerate(tribal_codes)}
+
+    distance = automation.contiguous_distance
+
+    graphs = {
+        "county_codes": np.array(county_codes),
+        "tribal_codes": np.array(tribal_codes),
+        "county_adjacent": pairs_to_matrix(
+            spatial_pairs(water, "FIPS_C", water, "FIPS_C", "INTERSECT"), county_index, county_index),
+        "tribal_adjacent": pairs_to_matrix(
+            spatial_pairs(tribal, "AIANNH", water, "FIPS_C", "INTERSECT"), tribal_index, county_index),
+        "county_near": pairs_to_matrix(
+            spatial_pairs(counties, "FIPS_C", counties, "FIPS_C", "WITHIN_A_DISTANCE_GEODESIC", distance),
+            county_index, county_index),
+        "tribal_near": pairs_to_matrix(
+            spatial_pairs(tribal, "AIANNH", counties, "FIPS_C", "WITHIN_A_DISTANCE_GEODESIC", distance),
+            tribal_index, county_index),
+    }
+
+    print_message(f"Built matrices for {len(county_codes)} counties and {len(tribal_codes)} tribal areas")
+
+    return graphs
+
+
+############################################################
+
+# Matrices that go in the cache file
+matrix_names = ["county_adjacent", "tribal_adjacent", "county_near", "tribal_near"]
+
+
+# Save the matrices (as row/column lists) along with a fingerprint of the layers
+# and distance they were built from
+def save_graphs(graphs, fingerprint):
+
+    arrays = {
+        "fingerprint": np.array(fingerprint),
+        "county_codes": graphs["county_codes"],
+        "tribal_codes": graphs["tribal_codes"],
+    }
+
+    for name in matrix_names:
+        coo = graphs[name].tocoo()
+        arrays[name + "_rows"] = coo.row
+        arrays[name + "_columns"] = coo.col
+
+    np.savez_compressed(graph_cache, **arrays)
+
+
+# Load the matrices back from the cache file; None if there's no cache
+# or it was built from different layers or a different distance
+def load_graphs(fingerprint):
+
+    if not os.path.exists(graph_cache):
+        return None
+
+    with np.load(graph_cache) as arrays:
+
+        if str(arrays["fingerprint"]) != fingerprint:
+            return None
+
+        graphs = {
+            "county_codes": arrays["county_codes"],
+            "tribal_codes": arrays["tribal_codes"],
+        }
+
+        county_count = len(graphs["county_codes"])
+        tribal_count = len(graphs["tribal_codes"])
+
+        for name in matrix_names:
+            row_count = tribal_count if name.startswith("tribal") else county_count
+            rows, columns = arrays[name + "_rows"], arrays[name + "_columns"]
+            graphs[name] = sparse.csr_matrix(
+                (np.ones(len(rows), dtype=np.int32), (rows, columns)),
+                shape=(row_count, county_count),
+            )
+
+    return graphs
+
+
+############################################################
+
+# Get the adjacency/distance matrices: from the cache if it's still good,
+# otherwise build them from the layers in the map and cache them for next time
+def get_graphs():
+
+    map_layers = automation.get_layers()
+
+    fingerprint = automation.hash_json([
+        automation.get_layer_versions(map_layers),
+        automation.contiguous_distance,
+    ])
+
+    graphs = load_graphs(fingerprint)
+
+    if graphs is None:
+        graphs = build_graphs(map_layers)
+        save_graphs(graphs, fingerprint)
+    else:
+        print_message("Loaded county adjacency and distance matrices from the cache")
+
+    return graphs
+
+
+############################################################
+
+# Read scenarios from an Excel file: one scenario per sheet, codes in the first column
+# (sheet name = scenario name). Same reader the map script uses for its input files.
+def scenarios_from_excel(file_path):
+
+    return automation.read_first_columns(file_path)
+
+
+############################################################
+
+# Encode every scenario's codes as one row of a sparse scenario x county
+# (and scenario x tribal area) matrix. Codes that aren't counties or tribal areas are ignored,
+# same as they would be by the map script.
+def encode_scenarios(scenarios, codes):
+
+    code_index = {code: i for i, code in enumerate(codes)}
+
+    rows = []
+    columns = []
+
+    for row, scenario_codes in enumerate(scenarios.values()):
+        for column in {code_index[c] for c in scenario_codes if c in code_index}:
+            rows.append(row)
+            columns.append(column)
+
+    return sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.int32), (rows, columns)),
+        shape=(len(scenarios), len(codes)),
+    )
+
+
+############################################################
+
+# THE BATCH WHAT-IF. scenarios is a dictionary of scenario name: list of Primary codes
+# (county FIPS and/or tribal codes, exactly like a map input sheet).
+# Does the same thing the map script does per map, but for every scenario at once:
+#   1. counties touching a Primary county or tribal area are Contiguous (counties with water)
+#   2. ...unless they're already Primary
+#   3. ...and they only stay Contiguous if they're within the contiguous distance
+#      of a Primary county or tribal area (non-water)
+# Returns a table with one row per scenario per Primary/Contiguous county, plus one per
+# Primary tribal area (what the map script writes to the " TRIBAL" table):
+# scenario, FIPS_C, AIANNH, CLASS (FIPS_C is blank on tribal rows, AIANNH on county rows)
+def what_if(scenarios, graphs=None):
+
+    if graphs is None:
+        graphs = get_graphs()
+
+    county_codes = graphs["county_codes"]
+    tribal_codes = graphs["tribal_codes"]
+
+    primary_counties = encode_scenarios(scenarios, county_codes)
+    primary_tribal = encode_scenarios(scenarios, tribal_codes)
+
+    # Steps 1 and 3: one sparse product each for all scenarios
+    adjacent = (primary_counties @ graphs["county_adjacent"] + primary_tribal @ graphs["tribal_adjacent"]) > 0
+    near = (primary_counties @ graphs["county_near"] + primary_tribal @ graphs["tribal_near"]) > 0
+
+    contiguous = adjacent.multiply(near).astype(bool)
+
+    # Step 2: Primary wins over Contiguous
+    contiguous = (contiguous.astype(np.int32) - contiguous.multiply(primary_counties > 0).astype(np.int32)) > 0
+
+    # Turn the matrices back into a table
+    scenario_names = np.array(list(scenarios.keys()), dtype=object)
+
+    tables = []
+
+    for matrix, map_class in [(primary_counties > 0, "Primary"), (contiguous, "Contiguous")]:
+        coo = sparse.coo_matrix(matrix)
+        tables.append(pd.DataFrame({
+            "scenario": scenario_names[coo.row],
+            "FIPS_C": county_codes[coo.col],
+            "AIANNH": None,
+            "CLASS": map_class,
+        }))
+
+    coo = sparse.coo_matrix(primary_tribal > 0)
+    tables.append(pd.DataFrame({
+        "scenario": scenario_names[coo.row],
+        "FIPS_C": None,
+        "AIANNH": tribal_codes[coo.col],
+        "CLASS": "Primary",
+    }))
+
+    results = pd.concat(tables, ignore_index=True)
+
+    # Keep scenarios in the order they were given, Primary before Contiguous
+    # (Primary tribal areas after the Primary counties)
+    results["order"] = results["scenario"].map({name: i for i, name in enumerate(scenarios)})
+    results = results.sort_values(["order", "CLASS", "FIPS_C", "AIANNH"], ascending=[True, False, True, True], kind="stable")
+
+    print_message(f"Finished {len(scenarios)} what-if scenarios")
+
+    return results.drop(columns="order").reset_index(drop=True)
+
+
+################################################################################
+# DO THE WORK
+################################################################################
+
+# Run every scenario in the scenario workbook and write out the results
+if __name__ == "__main__":
+
+    what_if(scenarios_from_excel(scenario_workbook)).to_csv(results_csv, index=False)
+
+    print_message(f"\nWrote what-if results to {results_csv}")
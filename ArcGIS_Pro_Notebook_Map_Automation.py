@@ -26,25 +26,127 @@ input_folder = r"C:\Users\misti.wudtke\OneDrive - USDA\PROJECTS\FSA_AutoMap_v3_1
 del_prior_outputs = True
 
 
+# If you only want to regenerate maps whose inputs have changed since the last run,
+# set this to True. The script keeps a manifest (output_manifest.json in the input folder)
+# of what went into every map: the codes, the map title, the reference layers,
+# the contiguous distance and the layout. Maps that match the manifest and still have
+# their outputs are skipped, and outputs for sheets that were removed get deleted.
+# When this is True, del_prior_outputs is ignored (that would defeat the purpose!)
+# To force everything to regenerate, set this to False or delete the manifest.
+
+incremental = False
+
+
+# Distance between non-water Primary and Contiguous counties beyond which
+# a county is NOT considered contiguous (e.g. across a Great Lake)
+
+contiguous_distance = "5 Miles"
+
+
+# File format for the tables that go in "Output Excels": "xlsx" (what the downstream
+# reports expect), "csv" or "parquet". And which columns to write: None writes every
+# attribute column (what Table To Excel used to write), or give a list of field names.
+
+table_format = "xlsx"
+
+table_fields = None
+
+
+# Simplified county/tribal boundaries for drawing the map. A map covering several states
+# can't show full-resolution boundaries, but they still get drawn (slow) and stuffed into
+# the PDF (big). Each entry is [map scale, simplification tolerance], smallest scale first:
+# maps at that scale or smaller (1:scale and up) draw boundaries simplified by that tolerance;
+# maps zoomed in closer than the first entry draw the full-resolution data.
+# Tolerances are about one 200 dpi pixel at the scale they start at.
+# Simplified copies of the layers are made once and kept in Carto_Cache.gdb
+# (in carto_cache_folder, or next to the .aprx if that's None); they get rebuilt
+# automatically when the county/tribal data or these bands change.
+# Set to [] to always draw the full-resolution data (the original behavior).
+
+carto_scale_bands = [
+    [1500000, "150 Meters"],
+    [5000000, "500 Meters"],
+    [15000000, "1500 Meters"],
+]
+
+carto_cache_folder = None
+
+
+# Path to the ArcGIS Pro project that holds "Main Map" and "Layout".
+# Leave as "CURRENT" to use the project currently open in ArcGIS Pro;
+# set it to the full path of the .aprx file when running as a standalone script.
+
+project_path = "CURRENT"
+
+
+# Number of maps to export at the same time. Leave at 1 to generate maps
+# one at a time (the original behavior). Anything higher clones the project
+# and its county/tribal data once per worker and splits the maps across
+# a pool of worker processes; all outputs still land in the same two output folders.
+# Parallel mode ONLY works when run as a standalone script (e.g. with propy.bat)
+# with project_path set to the .aprx file; child processes can't see "CURRENT".
+
+parallel_workers = 1
+
+
 ################################################################################
 # DO THE WORK
 ################################################################################
 
 import arcpy
+import hashlib
+import json
 import os
 import shutil
-import sys
+import tempfile
+import time
+import numpy as np
+import openpyxl
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+# Label tacked onto messages from worker processes so it's possible
+# to tell which worker is saying what (stays blank for normal runs)
+worker_label = ""
+
+# Geodatabase holding the simplified geometry, when it isn't the usual
+# Carto_Cache.gdb (worker processes use the copy in their own geodatabase)
+carto_gdb = ""
+
+# The project, once it's been opened (see get_project)
+open_project = None
 
 ############################################################
 
 # Print a message and also use addmessage method for toolbox use
 def print_message(message):
     
+    # In a worker process, stick the worker label in front of the message
+    # (after any leading blank lines so the output still lines up)
+    if worker_label:
+        text = message.lstrip("\n")
+        message = message[:len(message) - len(text)] + f"[{worker_label}] " + text
+
     print(message)
     arcpy.AddMessage(message)
 
 
+############################################################
+
+# Get the ArcGIS Pro project the script is working with;
+# the project open in ArcGIS Pro unless project_path says otherwise.
+# Opened ONE time per process and reused: "CURRENT" is cheap to get,
+# but opening an .aprx file from disk for every map is not.
+def get_project():
+
+    global open_project
+
+    if open_project is None:
+        open_project = arcpy.mp.ArcGISProject(project_path)
+
+    return open_project
+
+
 ############################################################
 
 # In the current map in the current project open in ArcGIS Pro,
@@ -53,7 +155,7 @@ def print_message(message):
 def get_layers():
 
     # Get the current project
-    current_project = arcpy.mp.ArcGISProject("CURRENT")
+    current_project = get_project()
 
     # Get the map in the project named "Main Map"
     main_map = current_project.listMaps("Main Map")[0]
@@ -108,62 +210,168 @@ def build_queries(in_layer):
 # Have reconfigured the script to work to generate both tribal
 # and non-tribal maps. Data for tribal maps is usually received in 
 # a slightly different format: 1 map per excel file vs 1 map per excel sheet.
-# Here we check whether the current script run is for tribal maps;
-# if it is, reprocess the excel dictionary to work on a per/excel basis.
+# Here we check which excel files are tribal and reprocess the excel dictionary
+# so tribal files work on a per/excel basis, while everything else stays per/sheet.
+# Tribal and non-tribal files can be mixed in the same folder; they all get made
+# in the same run (sharing the layers, lookup tables and resets), no need to split them up.
+# Returns [dictionary of map title: values list, set of the map titles that are tribal maps]
 def check_for_tribal(fips_dict, excel_files):
     
-    # Get list of excel files with the word "tribal" in the file name
-    # (This is how we make the determination of whether this is a tribal run)
-    tribal_files = [ef for ef in excel_files if "tribal" in ef.lower()]
-
-    # If there's at least one file with the word "tribal" in the name,
-    # continue with additional logic
-    if tribal_files:
-
-        # The script isn't set up to process a mix of tribal and non-tribal maps
-        # So, confirm that, if there's ONE tribal file, ALL the files are tribal
-        if not len(excel_files) == len(tribal_files):
-
-            # If it's a mix, give the user a warning to divy up the files
-            # and start the script over; exit script early after message.
-            print("""
-            \n\tAwe crap; it looks like there's a mix of tribal 
-            and non-tribal excel files in the input folder.
-            Since tribal and non-tribal are processed differently by the script,
-            There needs to be only ALL tribal or ALL non-tribal excel files 
-            in the folder for a given script run. Please fix, then run again!\n
-            (Note: Tribal excel files must have the word "tribal" in the file name;
-            non-tribal excel files must not have it.)
-            """)
-            print("\tExiting now! :)\n")
-            sys.exit()
-
-        # Assuming it's all-tribal-all-the-time, go ahead and reprocess dictionary
-        tribal_dict = {}
+    # Get titles (the way they show up in the map titles) of excel files
+    # with the word "tribal" in the file name
+    # (This is how we make the determination of whether a map is tribal)
+    tribal_titles = {ef.rsplit(".", 1)[0].replace("_", " ") for ef in excel_files if "tribal" in ef.lower()}
+
+    # Reprocessed dictionary, and which of its keys are tribal maps
+    jobs_dict = {}
+    tribal_keys = set()
+    
+    # Key values in original dict are composed of excel file name + sheet name;
+    # since tribal maps are generated per excel we only need the excel file name,
+    # so split the current key where it was concatenated previously by "__"
+    for k, val in fips_dict.items():
+        tk = k.split("__")[0]
+
+        # Non-tribal sheets are their own map, same as always
+        if not tk in tribal_titles:
+            jobs_dict[k] = val
         
-        # Key values in original dict are composed of excel file name + sheet name;
-        # since the map is generated per excel we only need the excel file name,
-        # so split the current key where it was concatenated previously by "__"
-        for k, val in fips_dict.items():
-            tk = k.split("__")[0]
-            
-            # Then for all values in the dict where the key excel file name is the same,
-            # smash all the values together in one total list:
-            # Add the key/val pair to the new tribal dict if it isn't already in it...
-            if not tk in tribal_dict:
-                tribal_dict[tk] = val
-            # If the key has already been added...
-            else:
-                # ...loop through values and append to current list of values
-                for v in val:
-                    tribal_dict[tk].append(v)
+        # Then for all values in the dict where the key excel file name is the same (and tribal),
+        # smash all the values together in one total list:
+        # Add the key/val pair to the new dict if it isn't already in it...
+        elif not tk in jobs_dict:
+            jobs_dict[tk] = val
+            tribal_keys.add(tk)
+
+        # If the key has already been added...
+        else:
+            # ...loop through values and append to current list of values
+            for v in val:
+                jobs_dict[tk].append(v)
+
+    if tribal_keys and len(tribal_keys) < len(jobs_dict):
+        print_message(f"\nMixed run: {len(tribal_keys)} tribal maps and {len(jobs_dict) - len(tribal_keys)} county maps")
                     
-        # Return the reprocessed dictionary and "True" for whether this is a tribal run
-        return [tribal_dict, True]
-    
-    # If this isn't a tribal run, just return the original dict pluse "False" for tribal run
-    else:
-        return [fips_dict, False]
+    # Return the reprocessed dictionary and the set of tribal map titles
+    return [jobs_dict, tribal_keys]
+
+
+############################################################
+
+# Excel cells come back from openpyxl as whatever type Excel stored them as.
+# Convert to text the same way pandas read_excel(dtype=str) used to,
+# so FIPS typed in as numbers still come out as "1001", not "1001.0"
+def cell_to_text(value):
+
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+
+    return str(value)
+
+
+############################################################
+
+# Read ONLY the first column of every sheet in one Excel file.
+# read_only mode streams the rows instead of loading the whole workbook,
+# and max_col=1 means none of the other columns ever get parsed.
+# Returns a dictionary of sheet name: list of non-blank values (header row skipped)
+def read_first_columns(file_path):
+
+    workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+
+    sheets = {}
+
+    try:
+        for worksheet in workbook.worksheets:
+
+            rows = worksheet.iter_rows(min_col=1, max_col=1, values_only=True)
+
+            # First row is the column header, we don't want it
+            next(rows, None)
+
+            # Extract non-blank values from the first column
+            values = [cell_to_text(row[0]) for row in rows if row and row[0] not in (None, "")]
+
+            # Ignore empty sheets
+            if values:
+                sheets[worksheet.title] = values
+
+    # read_only workbooks keep the file open until closed
+    finally:
+        workbook.close()
+
+    return sheets
+
+
+############################################################
+
+# Hash the contents of a file so a workbook that was re-saved
+# (or copied back in) with different contents never matches the cache
+def hash_file(file_path):
+
+    file_hash = hashlib.sha256()
+
+    with open(file_path, "rb") as in_file:
+        for chunk in iter(lambda: in_file.read(1024 * 1024), b""):
+            file_hash.update(chunk)
+
+    return file_hash.hexdigest()
+
+
+############################################################
+
+# Get the first-column values for every sheet in one Excel file,
+# from the cache if the file hasn't changed, otherwise by reading the file.
+# Cache entries are keyed by file path, size, modified time AND content hash;
+# if any of them differ, the workbook gets read again.
+def load_excel_sheets(file_path, fips_cache):
+
+    file_stats = os.stat(file_path)
+
+    entry = {
+        "size": file_stats.st_size,
+        "mtime": file_stats.st_mtime,
+        "sha256": hash_file(file_path),
+    }
+
+    cached = fips_cache.get(file_path)
+
+    if cached and all(cached[k] == v for k, v in entry.items()):
+        return cached
+
+    entry["sheets"] = read_first_columns(file_path)
+
+    return entry
+
+
+############################################################
+
+# Cache of parsed code lists lives in the input folder next to the Excel files
+def get_fips_cache_path():
+
+    return os.path.join(input_folder, "fips_cache.json")
+
+
+# Load a cache/manifest file from the last run (empty dictionary if there isn't one
+# or it got mangled somehow; worst case everything just gets redone)
+def load_json_file(file_path):
+
+    try:
+        with open(file_path) as json_file:
+            return json.load(json_file)
+
+    except (OSError, ValueError):
+        return {}
+
+
+# Save a cache/manifest file for next time. Write to a temp file and swap it in,
+# so a run that dies partway through can't leave a half-written file behind
+def save_json_file(file_path, data):
+
+    with open(file_path + ".tmp", "w") as json_file:
+        json.dump(data, json_file)
+
+    os.replace(file_path + ".tmp", file_path)
 
 
 ############################################################
@@ -174,6 +382,8 @@ def check_for_tribal(fips_dict, excel_files):
 # in each sheet of the excel file and smashes it into a list as the value of a dictionary.
 # (first column of data is usually county fips codes but may be tribal codes for tribal maps)
 # One key/value pair in the dictionary equals one output map.
+# Workbooks are read several at a time, and anything that hasn't changed
+# since the last run comes straight out of the cache without being read at all.
 def get_fips():
     
     # Get a list of all files in the folder
@@ -185,26 +395,23 @@ def get_fips():
     # Filter the list to include only Excel files
     excel_files = [file for file in file_list if file.endswith('.xlsx')]
 
-    # Iterate through Excel files
-    for excel_file in excel_files:
-
-        file_path = os.path.join(input_folder, excel_file)
+    file_paths = [os.path.join(input_folder, excel_file) for excel_file in excel_files]
 
-        # Read all sheets in the Excel file
-        excel_data = pd.read_excel(file_path, sheet_name=None, dtype=str)
+    fips_cache = load_json_file(get_fips_cache_path())
 
-        # Iterate through sheets
-        for sheet_name, sheet_data in excel_data.items():
+    # Read (or pull from the cache) all the Excel files at the same time;
+    # results come back in the same order as the file list
+    with ThreadPoolExecutor(max_workers=min(8, len(file_paths) or 1)) as executor:
+        entries = list(executor.map(lambda fp: load_excel_sheets(fp, fips_cache), file_paths))
 
-            # Ignore empty sheets
-            if sheet_data.empty:
-                continue
+    # Only keep cache entries for files still in the folder
+    save_json_file(get_fips_cache_path(), dict(zip(file_paths, entries)))
 
-            #  Extract the first column header
-            column_header = sheet_data.columns[0]
+    # Iterate through Excel files
+    for excel_file, entry in zip(excel_files, entries):
 
-            # Extract non-blank values from the first column
-            values = sheet_data[column_header].dropna().tolist()
+        # Iterate through sheets
+        for sheet_name, values in entry["sheets"].items():
 
             # Format excel document name for use in map title
             # Chop off the .xlsx extension and replace underscores with spaces
@@ -216,10 +423,11 @@ def get_fips():
             key = excel_title + "__" + str(sheet_title)
 
             # Add key-value pair to the dictionary
-            fips_dict[key] = values
+            # (a copy, so the tribal reprocessing can't mess with the cached lists)
+            fips_dict[key] = list(values)
             
-    # Check if this is a tribal session
-    # And reprocess dict to convert to tribal if it is
+    # Check which maps are tribal
+    # And reprocess dict to convert those to per/excel
     fips_stuff = check_for_tribal(fips_dict, excel_files)
 
     print_message("\nFinished generating dictionary of map titles and values lists")
@@ -246,8 +454,8 @@ def make_folders(folder_names):
         if os.path.exists(full_path):
 
             # If we are supposed to delete prior outputs, do that,
-            # then re-make the folder
-            if del_prior_outputs:
+            # then re-make the folder (but never in incremental mode)
+            if del_prior_outputs and not incremental:
                 shutil.rmtree(full_path)
                 os.mkdir(full_path)
 
@@ -261,6 +469,176 @@ def make_folders(folder_names):
     # Ship the full output path back to the rest of the script
     return full_paths
 
+
+############################################################
+
+# Manifest of what went into every map lives in the input folder next to the Excel files
+def get_manifest_path():
+
+    return os.path.join(input_folder, "output_manifest.json")
+
+
+# Hash anything that can be dumped to JSON (lists of codes, layer/layout details);
+# anything JSON can't handle on its own (dates, mostly) gets hashed as text
+def hash_json(data):
+
+    return hashlib.sha256(json.dumps(data, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+############################################################
+
+# "Version" of each reference layer: where the data lives, how many features,
+# the overall extent, and a hash of every attribute except CLASS
+# (CLASS gets flipped back and forth on every run, so it doesn't count).
+# If someone swaps or edits the county/tribal data, this changes and every map is redone.
+def get_layer_versions(map_layers):
+
+    layer_versions = {}
+
+    for map_layer in map_layers:
+
+        data_source = map_layer.dataSource
+
+        # Every attribute field except CLASS (and the geometry, which the extent covers)
+        fields = [f.name for f in arcpy.ListFields(data_source)
+                  if f.type != "Geometry" and f.name.upper() != "CLASS"]
+
+        with arcpy.da.SearchCursor(data_source, fields) as search_cursor:
+            attributes_hash = hash_json([list(row) for row in search_cursor])
+
+        layer_versions[map_layer.name] = {
+            "source": data_source,
+            "count": int(arcpy.management.GetCount(data_source)[0]),
+            "extent": str(arcpy.Describe(data_source).extent),
+            "attributes": attributes_hash,
+        }
+
+    return layer_versions
+
+
+############################################################
+
+# "Version" of the layout: page size plus the name, size and position of every element.
+# The title/subtitle TEXT changes for every map, so only where they sit counts.
+def get_layout_version():
+
+    layout = get_project().listLayouts("Layout")[0]
+
+    elements = [
+        [e.name, e.type, e.elementPositionX, e.elementPositionY, e.elementWidth, e.elementHeight]
+        for e in layout.listElements()
+    ]
+
+    return hash_json([layout.pageWidth, layout.pageHeight, layout.pageUnits, elements])
+
+
+############################################################
+
+# Full paths of the output files one map produces.
+# file_format is the table format to use (defaults to the current table_format)
+def get_output_paths(key, tribal, output_folders, file_format=None):
+
+    output_paths = [
+        os.path.join(output_folders[0], key + ".pdf"),
+        os.path.join(output_folders[1], table_file_name(key, file_format)),
+    ]
+
+    if tribal:
+        output_paths.append(os.path.join(output_folders[1], table_file_name(key + " TRIBAL", file_format)))
+
+    return output_paths
+
+
+# Full paths of the output files a map got on the last run, going by its manifest entry
+# (the tables may have been written in a different format than this run's);
+# entries from before the table format was recorded were always xlsx
+def get_manifest_output_paths(key, entry, output_folders):
+
+    return get_output_paths(key, entry["tribal"], output_folders, entry.get("tables", ["xlsx"])[0])
+
+
+############################################################
+
+# Incremental mode: compare every map against the manifest from the last run.
+# Returns [dictionary of maps that need to be (re)made, the manifest, new manifest entries].
+# Maps whose entry is unchanged AND whose outputs are all still there get skipped;
+# outputs for maps in the manifest that aren't in the Excel files anymore get deleted.
+def plan_incremental(map_layers, fips_dict, tribal_keys, output_folders):
+
+    manifest = load_json_file(get_manifest_path())
+
+    # Things that go into every map
+    layer_versions = get_layer_versions(map_layers)
+    layout_version = get_layout_version()
+
+    # Dictionary of maps that need work, and what their manifest entries will be once done
+    todo_dict = {}
+    pending = {}
+
+    for key, value in fips_dict.items():
+
+        tribal = key in tribal_keys
+
+        # Order and repeats of codes in the Excel don't change the map
+        entry = {
+            "codes": hash_json(sorted(set(value))),
+            "title": key,
+            "tribal": tribal,
+            "layers": layer_versions,
+            "distance": contiguous_distance,
+            "layout": layout_version,
+            "carto": carto_scale_bands,
+            "tables": [table_format, table_fields],
+        }
+
+        output_paths = get_output_paths(key, tribal, output_folders)
+
+        if manifest.get(key) != entry or not all(os.path.exists(op) for op in output_paths):
+            todo_dict[key] = value
+            pending[key] = entry
+
+            # Tables get written at the end of the run, after the manifest is updated;
+            # get rid of the old ones now so a run that dies can't leave stale ones looking current
+            # (including ones in whatever table format the last run used)
+            if key in manifest:
+                output_paths += get_manifest_output_paths(key, manifest[key], output_folders)
+
+            for output_path in output_paths:
+                if os.path.exists(output_path):
+                    os.remove(output_path)
+
+    # Clean up after any sheets (or whole Excel files) that were removed since last time
+    for key in [k for k in manifest if k not in fips_dict]:
+
+        for output_path in get_manifest_output_paths(key, manifest[key], output_folders):
+            if os.path.exists(output_path):
+                os.remove(output_path)
+
+        del manifest[key]
+
+        print_message(f"Removed outputs for map title '{key}' (no longer in the Excel files)")
+
+    # Save now so removed maps stay removed even if this run dies
+    save_json_file(get_manifest_path(), manifest)
+
+    print_message(f"\n{len(todo_dict)} of {len(fips_dict)} maps changed since the last run; skipping the rest")
+
+    return [todo_dict, manifest, pending]
+
+
+############################################################
+
+# Once maps are finished, move their new entries into the manifest and save it,
+# so a run that dies partway through only redoes the maps it didn't get to
+def update_manifest(manifest_stuff, finished_keys):
+
+    manifest, pending = manifest_stuff
+
+    for key in finished_keys:
+        manifest[key] = pending[key]
+
+    save_json_file(get_manifest_path(), manifest)
+
         
 ############################################################
 
@@ -364,9 +742,10 @@ def modify_contiguous(map_layers, queries):
     
     # Intersect non-water Primary with non-water Contigous, using "WITHIN_A_DISTANCE_GEODESIC"
     # Value used will depend on outcome of meeting tomorrow. Maybe 5 miles? 10 miles?
-    arcpy.management.SelectLayerByLocation(contig_carto, "WITHIN_A_DISTANCE_GEODESIC", prime_carto, "5 Miles")
+    # (Set by the contiguous_distance parameter at the top of the script)
+    arcpy.management.SelectLayerByLocation(contig_carto, "WITHIN_A_DISTANCE_GEODESIC", prime_carto, contiguous_distance)
 
-    arcpy.management.SelectLayerByLocation(contig_carto, "WITHIN_A_DISTANCE_GEODESIC", prime_tribal, "5 Miles", "ADD_TO_SELECTION")
+    arcpy.management.SelectLayerByLocation(contig_carto, "WITHIN_A_DISTANCE_GEODESIC", prime_tribal, contiguous_distance, "ADD_TO_SELECTION")
 
     # Then just invert the selection... 
     arcpy.management.SelectLayerByLocation(contig_carto, selection_type="SWITCH_SELECTION")
@@ -393,15 +772,297 @@ def modify_contiguous(map_layers, queries):
     arcpy.management.Delete(contig_carto)
 
 
+############################################################
+
+# How many meters in one layout page unit (for working out map scale)
+page_unit_meters = {
+    "INCH": 0.0254,
+    "CENTIMETER": 0.01,
+    "MILLIMETER": 0.001,
+    "POINT": 0.0254 / 72,
+}
+
+
+############################################################
+
+# Read the bounding box of every feature in a layer as a NumPy array
+# (one row per feature: xmin, ymin, xmax, ymax) in the given coordinate system,
+# along with a matching array of ObjectIDs
+def read_bboxes(map_layer, spatial_reference):
+
+    oids = []
+    boxes = []
+
+    with arcpy.da.SearchCursor(map_layer, ["OID@", "SHAPE@"], spatial_reference=spatial_reference) as search_cursor:
+        for oid, shape in search_cursor:
+            if shape is None:
+                continue
+            oids.append(oid)
+            boxes.append([shape.extent.XMin, shape.extent.YMin, shape.extent.XMax, shape.extent.YMax])
+
+    return np.array(oids, dtype=np.int64), np.array(boxes, dtype=np.float64).reshape(-1, 4)
+
+
+############################################################
+
+# Called once per script run (once per worker in parallel mode).
+# Precompute a bounding-box table for every county and tribal area in the
+# layout's coordinate system (for setting map extents). Also grab the map frame size so the map scale can be worked out from an extent
+# without touching the layout at all. Saves a select/get extent/clear round trip per map.
+def build_bbox_table(map_layers):
+
+    layout = get_project().listLayouts("Layout")[0]
+    map_frame = layout.listElements("MAPFRAME_ELEMENT", "Main Map")[0]
+
+    layout_sr = map_frame.map.spatialReference
+
+    bbox_table = {}
+
+    # Counties (non-water, the ones extents have always come from) and tribal areas
+    for map_layer in map_layers[:2]:
+
+        oids, layout_boxes = read_bboxes(map_layer, layout_sr)
+
+        bbox_table[map_layer.name] = {
+            "oids": oids,
+            "layout": layout_boxes,
+        }
+
+    # Map frame size in meters on the page, and meters per map unit on the ground.
+    # Scale can only be worked out this way for a projected map; otherwise
+    # export_map falls back to asking the camera after setting the extent.
+    frame_meters = page_unit_meters.get(layout.pageUnits)
+
+    if layout_sr.type == "Projected" and frame_meters:
+        bbox_table["frame"] = {
+            "width": map_frame.elementWidth * frame_meters,
+            "height": map_frame.elementHeight * frame_meters,
+            "meters_per_unit": layout_sr.metersPerUnit,
+        }
+
+    print_message("Built bounding box table for counties and tribal areas")
+
+    return bbox_table
+
+
+############################################################
+
+# Get the ObjectID: CLASS pairs for everything in a layer that matches a query
+# (e.g. everything coded Primary or Contiguous). Just a search cursor, no selections.
+def get_classification(map_layer, query):
+
+    with arcpy.da.SearchCursor(map_layer, ["OID@", "CLASS"], query) as search_cursor:
+        return {oid: map_class for oid, map_class in search_cursor}
+
+
+############################################################
+
+# Work out the map extent straight from the bounding-box table:
+# union of the boxes of every county coded Primary or Contiguous
+# (plus Primary tribal areas, so one poking out past its counties isn't cut off),
+# padded by 10% so extent counties are not right up to the edge of the map frame.
+# classification is the {layer name: {ObjectID: CLASS}} result for the current map.
+# Returns [xmin, ymin, xmax, ymax, map scale]; scale is None if it can't be worked out.
+def get_map_extent(bbox_table, classification):
+
+    boxes = []
+
+    for layer_name, layer_classes in classification.items():
+
+        layer_table = bbox_table[layer_name]
+        classified = np.fromiter(layer_classes, dtype=np.int64)
+
+        boxes.append(layer_table["layout"][np.isin(layer_table["oids"], classified)])
+
+    boxes = np.vstack(boxes)
+
+    # Nothing coded at all (codes not found?); fall back to all the counties
+    if not len(boxes):
+        boxes = np.vstack([bbox_table[layer_name]["layout"] for layer_name in classification])
+
+    xmin, ymin = boxes[:, :2].min(axis=0)
+    xmax, ymax = boxes[:, 2:].max(axis=0)
+
+    # Pad the box by 10% around its center (same as bumping the camera scale up 1.1x)
+    center_x, center_y = (xmin + xmax) / 2, (ymin + ymax) / 2
+    half_width, half_height = (xmax - xmin) / 2 * 1.1, (ymax - ymin) / 2 * 1.1
+
+    map_extent = [center_x - half_width, center_y - half_height, center_x + half_width, center_y + half_height]
+
+    # The camera fits the extent into the frame, so whichever side is the
+    # tighter fit sets the scale (ground meters per page meter)
+    frame = bbox_table.get("frame")
+
+    if frame:
+        map_scale = float(max(
+            2 * half_width * frame["meters_per_unit"] / frame["width"],
+            2 * half_height * frame["meters_per_unit"] / frame["height"],
+        ))
+    else:
+        map_scale = None
+
+    return [float(v) for v in map_extent] + [map_scale]
+
+
+############################################################
+
+#  Layers that get simplified copies, and the code field the CLASS coding
+#  is matched on (the copies have their own ObjectIDs, and so do worker copies of the data)
+carto_layers = {"US Counties": "FIPS_C", "Tribal Lands": "AIANNH", "US Counties Water": "FIPS_C"}
+
+
+# Where the simplified geometry lives
+def get_carto_gdb():
+
+    if carto_gdb:
+        return carto_gdb
+
+    folder = carto_cache_folder or os.path.dirname(get_project().filePath)
+
+    return os.path.join(folder, "Carto_Cache.gdb")
+
+
+# Feature class holding one layer's simplified geometry for one scale band
+def carto_band_path(layer_name, band_number, gdb=None):
+
+    gdb = gdb or get_carto_gdb()
+
+    return os.path.join(gdb, arcpy.ValidateTableName(f"{layer_name} Band {band_number}", gdb))
+
+
+############################################################
+
+# Called once per script run. Make the simplified copies of the county and tribal
+# layers for every scale band, unless the ones from last time are still good
+# (same layer versions the manifest uses, minus where the data lives, plus the bands).
+# Simplify Polygon keeps the border between two neighboring counties the same line
+# on both sides, so simplified counties still fit together with no gaps or slivers.
+def build_carto_cache(map_layers, query):
+
+    if not carto_scale_bands:
+        return
+
+    gdb = get_carto_gdb()
+    fingerprint_path = os.path.splitext(gdb)[0] + ".json"
+
+    layer_versions = get_layer_versions(map_layers)
+
+    for layer_version in layer_versions.values():
+        del layer_version["source"]
+
+    fingerprint = hash_json([layer_versions, carto_scale_bands])
+
+    if arcpy.Exists(gdb) and load_json_file(fingerprint_path).get("fingerprint") == fingerprint:
+
+        # Just in case a run died partway through a map, reset any CLASS it left behind
+        reset_class(
+            [carto_band_path(map_layer.name, band_number) for map_layer in map_layers for band_number in range(len(carto_scale_bands))],
+            query,
+        )
+
+        print_message("\nUsing simplified map geometry from the last run")
+        return
+
+    print_message("\nBuilding simplified map geometry (only happens when the county/tribal data changes)")
+
+    if arcpy.Exists(gdb):
+        arcpy.management.Delete(gdb)
+
+    arcpy.management.CreateFileGDB(os.path.dirname(gdb), os.path.basename(gdb))
+
+    for map_layer in map_layers:
+        for band_number, (band_scale, tolerance) in enumerate(carto_scale_bands):
+
+            band_path = carto_band_path(map_layer.name, band_number, gdb)
+
+            # Simplify the full dataset behind the layer (not the layer, same as clone_project);
+            # tiny polygons are kept (minimum area 0) so no county goes missing
+            arcpy.cartography.SimplifyPolygon(
+                map_layer.dataSource, band_path, "POINT_REMOVE", tolerance,
+                "0 SquareMeters", "RESOLVE_ERRORS", "NO_KEEP",
+            )
+
+            # Every map codes and resets rows by code, so index it
+            arcpy.management.AddIndex(band_path, carto_layers[map_layer.name], "CODE_IDX")
+
+    save_json_file(fingerprint_path, {"fingerprint": fingerprint, "bands": carto_scale_bands})
+
+    print_message(f"Built simplified geometry for {len(carto_scale_bands)} scale bands")
+
+
+############################################################
+
+# Which scale band a map falls in (None = draw the full-resolution data)
+def get_carto_band(map_scale):
+
+    band_number = None
+
+    for number, (band_scale, tolerance) in enumerate(carto_scale_bands):
+        if map_scale >= band_scale:
+            band_number = number
+
+    return band_number
+
+
+# Point the layout's layers at the simplified geometry for a scale band,
+# after copying the current map's CLASS coding over to it (by code, see carto_layers)
+# so the symbology and labels come out the same.
+# What restore_full_geometry needs to put everything back goes in swapped (the caller's list)
+# one layer at a time, before that layer gets touched, so if this blows up partway through
+# the caller can still put back whatever got changed.
+def use_carto_band(layout_map, band_number, query, swapped):
+
+    for layer_name, id_field in carto_layers.items():
+
+        map_layer = layout_map.listLayers(layer_name)[0]
+        band_path = carto_band_path(layer_name, band_number)
+
+        classes = {code: map_class for code, map_class in arcpy.da.SearchCursor(map_layer.dataSource, [id_field, "CLASS"], query)}
+
+        band_query = f"{id_field} IN ('" + "', '".join(classes) + "')" if classes else None
+
+        full_connection = map_layer.connectionProperties
+
+        swapped.append([map_layer, full_connection, band_path, band_query])
+
+        if classes:
+            with arcpy.da.UpdateCursor(band_path, [id_field, "CLASS"], band_query) as update_cursor:
+                for row in update_cursor:
+                    row[1] = classes[row[0]]
+                    update_cursor.updateRow(row)
+
+        map_layer.updateConnectionProperties(
+            full_connection,
+            {
+                "connection_info": {"database": os.path.dirname(band_path)},
+                "dataset": os.path.basename(band_path),
+                "workspace_factory": "File Geodatabase",
+            },
+        )
+
+
+# Point the layers back at the full-resolution data and reset CLASS in the simplified copies
+def restore_full_geometry(swapped):
+
+    for map_layer, full_connection, band_path, band_query in swapped:
+
+        map_layer.updateConnectionProperties(map_layer.connectionProperties, full_connection)
+
+        if band_query:
+            reset_class([band_path], band_query)
+
+
 ############################################################
 
 #  Literally just zoom to map extent in layout template, populate title, export
-def export_map(map_layer, map_title, query, pdf_folder):
+#  (extent comes from get_map_extent, already padded).
+#  At smaller scales the layers draw from the simplified geometry for the map's scale band.
+def export_map(map_extent, map_title, query, pdf_folder):
     
     arcpy.env.workspace = pdf_folder
     
     # Get the current project
-    current_project = arcpy.mp.ArcGISProject("CURRENT")
+    current_project = get_project()
 
     # Get map layout
     layout = current_project.listLayouts("Layout")[0]
@@ -412,54 +1073,128 @@ def export_map(map_layer, map_title, query, pdf_folder):
     # Get map frame layout element
     overview_frame = layout.listElements("MAPFRAME_ELEMENT", "Overview Map")[0]    
     
-    # Select counties currently coded as either primary or contiguous
-    arcpy.management.SelectLayerByAttribute(map_layer, "NEW_SELECTION", query)
+    # Apply extent (Primary + Contiguous, already padded) to layout map frame
+    xmin, ymin, xmax, ymax, map_scale = map_extent
+    map_frame.camera.setExtent(arcpy.Extent(xmin, ymin, xmax, ymax, spatial_reference=map_frame.map.spatialReference))
     
-    # Get extent of selected features to use
-    selected_extent = map_frame.getLayerExtent(map_layer, True, True)
+    # If the scale couldn't be worked out ahead of time, ask the camera
+    if map_scale is None:
+        map_scale = map_frame.camera.scale
     
-    # Apply extent to layout map frame
-    map_frame.camera.setExtent(selected_extent)
-    
-    # Clear selected features
-    arcpy.management.SelectLayerByAttribute(map_layer, "CLEAR_SELECTION")
-    
-    # Zoom out a little so extent counties are not right up to the edge of the map frame
-    map_frame.camera.scale = map_frame.camera.scale * 1.1
-    
-    # Zoom out a little so extent counties are not right up to the edge of the map frame
-    overview_frame.camera.scale = map_frame.camera.scale * 8
+    # Zoom out the overview map well past the main map
+    overview_frame.camera.scale = map_scale * 8
     
     # Populate the map title dynamic text using Excel file name or file name/sheet combo
     layout.listElements("TEXT_ELEMENT", "Title")[0].text = map_title.split(".")[0]
     layout.listElements("TEXT_ELEMENT", "Subtitle")[0].text = map_title.split(".")[0]
     
-    # Export layout - can adjust resolution here manually if desired
-    layout.exportToPDF(os.path.join(pdf_folder, map_title), resolution=200)
-    
+    # Swap in the simplified geometry if the map is zoomed out far enough, then
+    # export layout - can adjust resolution here manually if desired
+    # (always put the full-resolution data back, even if the swap or the export blows up)
+    band_number = get_carto_band(map_scale)
+    swapped = []
+
+    try:
+        if band_number is not None:
+            use_carto_band(map_frame.map, band_number, query, swapped)
+
+        layout.exportToPDF(os.path.join(pdf_folder, map_title), resolution=200)
+    finally:
+        restore_full_geometry(swapped)
+
     print_message("\tFinished exporting the current map")
     
     
+############################################################
+
+# Called once per script run (once per worker in parallel mode).
+# Read the attribute table of the county and tribal layers into memory ONE time,
+# so exporting the tables for each map is just picking out rows instead of
+# running Table To Excel (select, export every column, clear) over and over.
+# Tables are indexed by ObjectID to line up with the classification results.
+def build_attribute_tables(map_layers):
+
+    attribute_tables = {}
+
+    for map_layer in map_layers[:2]:
+
+        # Every attribute column, same as Table To Excel, unless told otherwise
+        fields = [f.name for f in arcpy.ListFields(map_layer) if f.type not in ("Geometry", "Blob", "Raster")]
+
+        if table_fields:
+            fields = [f for f in table_fields if f in fields]
+
+        with arcpy.da.SearchCursor(map_layer, ["OID@"] + fields) as search_cursor:
+            attribute_tables[map_layer.name] = pd.DataFrame(list(search_cursor), columns=["OID@"] + fields).set_index("OID@")
+
+    print_message("Read attribute tables for counties and tribal areas")
+
+    return attribute_tables
+
+
+############################################################
+
+# Called once per script run (once per worker in parallel mode).
+# Everything precomputed for the whole run that every map gets to reuse
+def build_lookup_tables(map_layers):
+
+    return {
+        "bboxes": build_bbox_table(map_layers),
+        "attributes": build_attribute_tables(map_layers),
+    }
+
+
+############################################################
+
+# Name of an exported table file, in whichever format table_format says
+# (or file_format, for tables an earlier run wrote in some other format)
+def table_file_name(name, file_format=None):
+
+    return f"{name}.{file_format or table_format}"
+
+
 ############################################################
 
 # Export excel files (previously dbf was used; just wtaf);
 # these are ingested downstream by some xlsm file to populate
 # excel reports, some word doc letter...someday, when we near our goal
 # of taking over the world, all of that will go away...
-def export_excel(map_layer, file_name, queries, excel_folder):
-    
-    arcpy.env.workspace = excel_folder
+# Rows come from the in-memory attribute table joined to the current map's
+# classification; they're saved up in table_batch and written all at once by write_tables.
+def export_excel(map_layer, table_name, attribute_tables, classification, table_batch):
+
+    layer_classes = classification[map_layer.name]
+    attribute_table = attribute_tables[map_layer.name]
+
+    # Rows for counties (or tribal areas) currently coded as either primary or contiguous
+    rows = attribute_table[attribute_table.index.isin(list(layer_classes))].copy()
 
-    # Select counties currently coded as either primary or contiguous
-    arcpy.management.SelectLayerByAttribute(map_layer, "NEW_SELECTION", queries[2])
+    # The cached table was read before any coding happened, so fill in CLASS for this map
+    if "CLASS" in rows.columns:
+        rows["CLASS"] = rows.index.map(layer_classes)
 
-    # Use Table to Excel GP tool to export
-    arcpy.conversion.TableToExcel(map_layer, file_name)
+    table_batch[table_file_name(table_name)] = rows
 
-    # Clear selected features
-    arcpy.management.SelectLayerByAttribute(map_layer, "CLEAR_SELECTION")
 
-    print_message("\tFinished exporting the Excel files")
+############################################################
+
+# Write every table saved up by export_excel in one go
+def write_tables(table_batch, excel_folder):
+
+    for file_name, rows in table_batch.items():
+
+        table_path = os.path.join(excel_folder, file_name)
+
+        if table_format == "csv":
+            rows.to_csv(table_path, index=False)
+
+        elif table_format == "parquet":
+            rows.to_parquet(table_path, index=False)
+
+        else:
+            rows.to_excel(table_path, index=False)
+
+    print_message(f"\nFinished exporting {len(table_batch)} {table_format} files")
     
 
 ############################################################
@@ -467,9 +1202,10 @@ def export_excel(map_layer, file_name, queries, excel_folder):
 # Once both buffered and unbuffered maps and excel documents are exported,
 # reset the "CLASS" attribute to "Not Selected" for both county and tribal layers.
 # (This effectively resets symbology and labels for the entire map)
+# Works on layers or on feature class paths (the simplified copies in the carto cache).
 def reset_class(map_layers, query):
     
-    # Loop happens 2x, once for counties once for tribal areas
+    # Loop happens once per layer (counties, tribal areas, water counties) or feature class
     for map_layer in map_layers:
         
         # Tried just calcing this field but it was throwing an error
@@ -478,54 +1214,278 @@ def reset_class(map_layers, query):
             for row in update_cursor:
                 row[0] = "Not Selected"
                 update_cursor.updateRow(row)
-
-    print_message("\tFinished resetting CLASS attribute")
     
 
+############################################################
+
+# Run one step of the map loop and add how long it took to that step's total
+def timed(stage_times, stage, function, *args):
+
+    start = time.perf_counter()
+    result = function(*args)
+    stage_times[stage] = stage_times.get(stage, 0.0) + time.perf_counter() - start
+
+    return result
+
+
+# Timing details go out through print_message as a label followed by
+# one line of JSON (seconds, rounded to a tenth of a millisecond)
+def print_timing(label, timing):
+
+    def rounded(value):
+        if isinstance(value, dict):
+            return {k: rounded(v) for k, v in value.items()}
+        if isinstance(value, float):
+            return round(value, 4)
+        return value
+
+    print_message(f"\t{label}: {json.dumps(rounded(timing))}")
+
+
 ############################################################
 
 # The meat and potatoes of the script--iterate through the dictionary of fips codes
 # (And possibly tribal codes) and create 2 maps + 2 excels 
 # (1 set buffered, 1 set not buffered) for each iteration.
-def iterate_maps(map_layers, fips_dict, tribal, queries, output_folders):
+# tribal_keys is the set of map titles that are tribal maps (any or all of them, or none).
+# In incremental mode, manifest_stuff is [manifest, new entries] and the
+# manifest gets updated as each map finishes.
+def iterate_maps(map_layers, fips_dict, tribal_keys, queries, output_folders, lookup_tables, manifest_stuff=None):
     
+    # Tables for every map get saved up here and written at the end.
+    # They get written even if a map blows up partway through the run: maps before it are
+    # already marked done in the manifest, and an incremental re-run won't redo their tables.
+    table_batch = {}
+
     # For non-tribal maps, "key" is every excel sheet and "value" is list of 5-digit FIPS codes
     # for tribal maps, "key" is every excel file title and "value" is list of FIPS + tribal codes
-    for key, value in fips_dict.items():
+    try:
+        for key, value in fips_dict.items():
         
-        print_message(f"\nWorking on map title '{key}'")
+            print_message(f"\nWorking on map title '{key}'")
+
+            tribal = key in tribal_keys
+
+            # Seconds spent in each step for this map (tribal steps count toward the same steps)
+            stage_times = {}
+            map_start = time.perf_counter()
 
-        # If this is a tribal map, 2nd call to code Primary tribal areas as well
-        if tribal:
+            # If this is a tribal map, 2nd call to code Primary tribal areas as well
+            if tribal:
             
-            code_primary([map_layers[1]], value, "AIANNH")
+                timed(stage_times, "code_primary", code_primary, [map_layers[1]], value, "AIANNH")
+
+                # Call to function to code contiguous counties
+                timed(stage_times, "code_contiguous", code_contiguous, map_layers[1], map_layers[2], queries[0])
+
+            # Call to function to iterate through counties and code "CLASS" attribute as Primary
+            timed(stage_times, "code_primary", code_primary, [map_layers[0], map_layers[2]], value, "FIPS_C")
 
             # Call to function to code contiguous counties
-            code_contiguous(map_layers[1], map_layers[2], queries[0])
+            timed(stage_times, "code_contiguous", code_contiguous, map_layers[2], map_layers[2], queries[0])
+
+            # Call to function to modify contiguous counties if necessary
+            timed(stage_times, "modify_contiguous", modify_contiguous, map_layers, queries)
+
+            # Call to function to read back what got coded Primary/Contiguous in counties and tribal areas
+            classification = timed(stage_times, "classification", lambda: {ml.name: get_classification(ml, queries[2]) for ml in map_layers[:2]})
+
+            # Call to function to work out the map extent from the bounding-box table
+            map_extent = timed(stage_times, "map_extent", get_map_extent, lookup_tables["bboxes"], classification)
+
+            # Call to function to export the map layout as .pdf
+            timed(stage_times, "export_map", export_map, map_extent, key + ".pdf", queries[2], output_folders[0])
+
+            # Call to function to export the associated excel file(s)
+            if tribal:
+                timed(stage_times, "export_excel", export_excel, map_layers[1], key + " TRIBAL", lookup_tables["attributes"], classification, table_batch)
 
-            export_excel(map_layers[1], key + " TRIBAL.xlsx", queries, output_folders[1])
+            timed(stage_times, "export_excel", export_excel, map_layers[0], key, lookup_tables["attributes"], classification, table_batch)
 
-        # Call to function to iterate through counties and code "CLASS" attribute as Primary
-        code_primary([map_layers[0], map_layers[2]], value, "FIPS_C")
+            # Call to function to reset CLASS attribute for both layers
+            timed(stage_times, "reset_class", reset_class, map_layers, queries[2])
 
-        # Call to function to code contiguous counties
-        code_contiguous(map_layers[2], map_layers[2], queries[0])
+            print_message("\tFinished resetting CLASS attribute")
 
-        # Call to function to modify contiguous counties if necessary
-        modify_contiguous(map_layers, queries)
+            if manifest_stuff:
+                update_manifest(manifest_stuff, [key])
 
-        # Call to function to export the map layout as .pdf
-        export_map(map_layers[0], key + ".pdf", queries[2], output_folders[0])
+            print_message(f"Finished map title '{key}'")
 
-        # Call to function to export the associated excel file
-        export_excel(map_layers[0], key + ".xlsx", queries, output_folders[1])
+            # One line of JSON per map so timings can be picked out of the messages later
+            print_timing("Map timing", {"map": key, "tribal": tribal, "stages": stage_times, "total": time.perf_counter() - map_start})
 
-        # Call to function to reset CLASS attribute for both layers
-        reset_class(map_layers, queries[2])
+    finally:
+        # Call to function to write all the excel files in one pass
+        write_start = time.perf_counter()
+        write_tables(table_batch, output_folders[1])
 
-        print_message(f"Finished map title '{key}'")
+        print_timing("Run timing", {"maps": len(fips_dict), "write_tables": time.perf_counter() - write_start})
     
 
+############################################################
+
+# Split the dictionary of map titles/values lists into one smaller dictionary
+# per worker. Maps are dealt out like cards so every worker gets a similar share;
+# tribal maps (more work each) and the biggest maps get dealt first,
+# so no one worker ends up with all the slow ones at the end.
+def split_fips_dict(fips_dict, tribal_keys, worker_count):
+
+    worker_dicts = [{} for _ in range(worker_count)]
+
+    deal_order = sorted(fips_dict, key=lambda k: (k not in tribal_keys, -len(fips_dict[k])))
+
+    for i, key in enumerate(deal_order):
+        worker_dicts[i % worker_count][key] = fips_dict[key]
+
+    # Don't bother spinning up workers that have nothing to do
+    return [wd for wd in worker_dicts if wd]
+
+
+############################################################
+
+# Every worker needs its own copy of the project AND of the data behind the
+# county/tribal layers; the CLASS attribute gets edited for every map, so workers
+# sharing the same feature classes would trample each other's coding.
+# Save a copy of the project, copy the three layers' data into a worker
+# file geodatabase, and point the layers in the copied project at it.
+def clone_project(worker_number, scratch_folder):
+
+    # Each worker gets its own folder for its project and geodatabase
+    worker_folder = os.path.join(scratch_folder, f"Worker {worker_number}")
+    os.mkdir(worker_folder)
+
+    # Save a copy of the project for the worker
+    worker_aprx = os.path.join(worker_folder, f"Worker_{worker_number}.aprx")
+    get_project().saveACopy(worker_aprx)
+
+    # Make the worker geodatabase
+    worker_gdb = os.path.join(worker_folder, f"Worker_{worker_number}.gdb")
+    arcpy.management.CreateFileGDB(worker_folder, f"Worker_{worker_number}.gdb")
+
+    # Open the copied project and find the same layers get_layers() uses
+    worker_project = arcpy.mp.ArcGISProject(worker_aprx)
+    worker_map = worker_project.listMaps("Main Map")[0]
+
+    for layer_name in ["US Counties", "Tribal Lands", "US Counties Water"]:
+
+        map_layer = worker_map.listLayers(layer_name)[0]
+
+        # Copy the full dataset behind the layer (dataSource, not the layer itself,
+        # so any selection or definition query doesn't trim what gets copied)
+        fc_name = arcpy.ValidateTableName(layer_name, worker_gdb)
+        arcpy.management.CopyFeatures(map_layer.dataSource, os.path.join(worker_gdb, fc_name))
+
+        # Re-point the layer in the copied project at the worker copy of the data
+        map_layer.updateConnectionProperties(
+            map_layer.connectionProperties,
+            {
+                "connection_info": {"database": worker_gdb},
+                "dataset": fc_name,
+                "workspace_factory": "File Geodatabase",
+            },
+        )
+
+    # The simplified geometry gets coded for every map too, so workers need their own copy of it
+    if carto_scale_bands:
+        for layer_name, id_field in carto_layers.items():
+            for band_number in range(len(carto_scale_bands)):
+                worker_band = carto_band_path(layer_name, band_number, worker_gdb)
+                arcpy.management.CopyFeatures(carto_band_path(layer_name, band_number), worker_band)
+                arcpy.management.AddIndex(worker_band, id_field, "CODE_IDX")
+
+    worker_project.save()
+
+    # Let go of the project so the worker process can open it
+    del worker_project
+
+    return worker_aprx
+
+
+############################################################
+
+# This is what runs inside each worker process. Point the script at the worker's
+# copy of the project, grab the layers from it, and run the normal map loop
+# over the worker's share of the maps.
+def run_worker(worker_number, worker_aprx, fips_dict, tribal_keys, output_folders):
+
+    # These only change inside the worker process, not in the main script
+    global project_path, worker_label, carto_gdb, open_project
+    project_path = worker_aprx
+    open_project = None
+    worker_label = f"Worker {worker_number}"
+    carto_gdb = os.path.splitext(worker_aprx)[0] + ".gdb"
+
+    print_message(f"Starting on {len(fips_dict)} maps")
+
+    map_layers = get_layers()
+
+    queries = build_queries(map_layers[0])
+
+    clear_all(map_layers)
+
+    # Worker's own copy of the data has its own ObjectIDs, so it needs its own tables
+    lookup_tables = build_lookup_tables(map_layers)
+
+    iterate_maps(map_layers, fips_dict, tribal_keys, queries, output_folders, lookup_tables)
+
+    # Send back the worker number and the map titles it finished
+    return [worker_number, list(fips_dict.keys())]
+
+
+############################################################
+
+# Parallel version of iterate_maps: clone the project once per worker,
+# split the maps across a pool of processes, and report as workers finish.
+# Outputs go in the same "Output PDFs" / "Output Excels" folders as always.
+# In incremental mode the manifest is updated here (not in the workers)
+# as each worker finishes, so workers never fight over the manifest file.
+def iterate_maps_parallel(fips_dict, tribal_keys, output_folders, manifest_stuff=None):
+
+    # Scratch folder for the worker projects and geodatabases, in the local temp folder:
+    # NOT next to the input files, which usually live in OneDrive, and file geodatabases
+    # in a synced folder run into sync and schema locks
+    scratch_folder = tempfile.mkdtemp(prefix="Map_Automation_Workers_")
+
+    # Clean up the worker projects and data when done, even if a clone or a worker blows up
+    # (otherwise a copy of the project and the county/tribal data piles up in temp every failed run)
+    try:
+        # Divvy up the maps
+        worker_dicts = split_fips_dict(fips_dict, tribal_keys, parallel_workers)
+
+        # Clone the project once per worker
+        worker_aprxs = []
+
+        for worker_number, worker_dict in enumerate(worker_dicts, start=1):
+            worker_aprxs.append(clone_project(worker_number, scratch_folder))
+            print_message(f"Worker {worker_number}: cloned project for {len(worker_dict)} maps")
+
+        maps_done = 0
+
+        with ProcessPoolExecutor(max_workers=len(worker_dicts)) as executor:
+
+            futures = [
+                executor.submit(run_worker, worker_number, worker_aprx, worker_dict, tribal_keys, output_folders)
+                for worker_number, (worker_aprx, worker_dict) in enumerate(zip(worker_aprxs, worker_dicts), start=1)
+            ]
+
+            print_message(f"\nStarted {len(futures)} workers for {len(fips_dict)} maps")
+
+            # Report on each worker as it finishes; result() re-raises anything
+            # that blew up inside a worker so it doesn't fail silently
+            for future in as_completed(futures):
+                worker_number, finished = future.result()
+                maps_done += len(finished)
+
+                if manifest_stuff:
+                    update_manifest(manifest_stuff, finished)
+
+                print_message(f"Worker {worker_number} finished {len(finished)} maps ({maps_done} of {len(fips_dict)} done)")
+
+    finally:
+        shutil.rmtree(scratch_folder, ignore_errors=True)
+
+
 ############################################################
 
 def do_the_work():
@@ -541,6 +1501,8 @@ def do_the_work():
 
     # Call to function to reset CLASS attribute for both layers
     reset_class(map_layers, queries[2])
+
+    print_message("\tFinished resetting CLASS attribute")
     
     # Call to function to get all the fips codes from all the sheets in all the excel files in a folder
     fips_stuff = get_fips()
@@ -548,9 +1510,33 @@ def do_the_work():
     # Provide string names for our two output folders
     output_folders = make_folders(["Output PDFs", "Output Excels"])
 
-    # Call to function to iterate fips_dict and export a single map
-    # Various per-map functions are called from within this function
-    iterate_maps(map_layers, fips_stuff[0], fips_stuff[1], queries, output_folders)
+    fips_dict = fips_stuff[0]
+    manifest_stuff = None
+
+    # In incremental mode, trim the dictionary down to only the maps that changed
+    if incremental:
+        fips_dict, *manifest_stuff = plan_incremental(map_layers, fips_dict, fips_stuff[1], output_folders)
+
+    # Call to function to make (or check) the simplified geometry the layout draws at smaller scales
+    build_carto_cache(map_layers, queries[2])
+
+    # Parallel mode needs a real .aprx path; worker processes can't use "CURRENT"
+    if parallel_workers > 1 and project_path == "CURRENT":
+        print_message("\nparallel_workers needs project_path set to the .aprx file; generating maps one at a time")
+
+    if parallel_workers > 1 and project_path != "CURRENT" and len(fips_dict) > 1:
+
+        # Call to function to split the maps across worker processes
+        iterate_maps_parallel(fips_dict, fips_stuff[1], output_folders, manifest_stuff)
+
+    else:
+
+        # Call to function to precompute bounding boxes and attribute tables for every county and tribal area
+        lookup_tables = build_lookup_tables(map_layers)
+
+        # Call to function to iterate fips_dict and export a single map
+        # Various per-map functions are called from within this function
+        iterate_maps(map_layers, fips_dict, fips_stuff[1], queries, output_folders, lookup_tables, manifest_stuff)
 
     # Print status message
     print_message("\nFinished generating all maps successfully")
@@ -562,4 +1548,8 @@ def do_the_work():
 
 # Call to the MAIN OVERARCHING function from which all other functions are called
 # One call does it all...should make it easier to stuff in a toolbox later
-do_the_work()
+# (Only when run directly; worker processes for parallel mode import this script
+# and must NOT kick off the whole thing again)
+if __name__ == "__main__":
+    do_the_work()
+
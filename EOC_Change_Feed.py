@@ -0,0 +1,222 @@
+# # EOC Change Feed
+
+# Append-only log of what the EOC Dashboard notebooks change in the historical layers,
+# so downstream stuff (notification scripts, the Hub site, reporting) can pick up
+# ONLY what's new since the last time they looked, instead of querying the whole
+# Impacted Historical / NWS Historical layers over and over.
+
+# Every change gets a sequence number that only ever goes up. Each notebook run writes
+# one segment file holding that run's changes, named by its first and last sequence numbers:
+#     segment_000000000001_000000000057.jsonl
+# Consumers keep track of the last sequence number they've seen (their "cursor")
+# and ask for everything after it with read_changes().
+
+# One change record looks like:
+#     {"seq": 58, "ts": "2024-05-12T21:03:11+00:00", "op": "add", "layer": "sc_hist",
+#      "key": "<Site_ID>|<event key>", "attributes": {...}, "geometry": {...}}
+# (event key is the warning's VTEC event, or its Uid; see EOC_VTEC.py)
+# op is "add" (new feature written to the layer), "update" (a later NWS product for the same
+# warning rewrote an existing row in place, see EOC_VTEC.py) or "delete" (dropped by the retention delete).
+
+# This file needs to sit next to the notebooks (e.g. in /arcgis/home) so they can import it.
+
+import json
+import os
+from datetime import datetime, timezone
+
+########## ########## ########## ########## ########## ##########
+
+# # Writing
+
+# Turn a Feature (or a feature dictionary, like the Enterprise notebook builds) into a change record
+def feature_change(op, layer, key, feature):
+
+    feature_dict = feature if isinstance(feature, dict) else feature.as_dict
+
+    return {
+        "op": op,
+        "layer": layer,
+        "key": key,
+        "attributes": feature_dict.get("attributes", {}),
+        "geometry": feature_dict.get("geometry"),
+    }
+
+
+# edit_features() reports success per feature; only keep the features that actually made it in
+def successful_adds(features, edit_result):
+
+    results = edit_result.get("addResults", []) if isinstance(edit_result, dict) else []
+
+    return [f for f, r in zip(features, results) if r.get("success")]
+
+
+# Same for updates
+def successful_updates(features, edit_result):
+
+    results = edit_result.get("updateResults", []) if isinstance(edit_result, dict) else []
+
+    return [f for f, r in zip(features, results) if r.get("success")]
+
+
+# Same for deletes, which come back by ObjectID rather than in order
+def successful_deletes(features, edit_result, oid_field):
+
+    results = edit_result.get("deleteResults", []) if isinstance(edit_result, dict) else []
+    deleted_ids = {r.get("objectId") for r in results if r.get("success")}
+
+    return [f for f in features if f.attributes[oid_field] in deleted_ids]
+
+
+# The feed keeps the next sequence number in a little state file.
+# The segments themselves are the real record, though: next_seq never goes below one past
+# the last segment in the folder, so a missing or stale state file can't reuse sequence numbers
+def read_state(feed_folder):
+
+    try:
+        with open(os.path.join(feed_folder, "feed_state.json")) as state_file:
+            state = json.load(state_file)
+
+    except (OSError, ValueError):
+        state = {"next_seq": 1}
+
+    segments = list_segments(feed_folder)
+
+    if segments and state["next_seq"] <= segments[-1][1]:
+        print(f"Change feed state is behind the segments in {feed_folder}; carrying on from seq {segments[-1][1] + 1}")
+        state = {"next_seq": segments[-1][1] + 1}
+
+    return state
+
+
+# Write to a temp file and swap it in, so a reader never sees half a file
+def write_atomic(file_path, write):
+
+    with open(file_path + ".tmp", "w", encoding="utf-8") as out_file:
+        write(out_file)
+
+    os.replace(file_path + ".tmp", file_path)
+
+
+# Add a run's worth of changes to the feed as one new segment.
+# segment_format is "jsonl" (one JSON record per line) or "parquet"
+# (needs pandas + pyarrow; attributes/geometry are stored as JSON text columns).
+# Sends back the [first, last] sequence numbers written, or None if there was nothing to write.
+def append_changes(feed_folder, changes, segment_format="jsonl"):
+
+    if not changes:
+        return None
+
+    os.makedirs(feed_folder, exist_ok=True)
+
+    state = read_state(feed_folder)
+    first_seq = state["next_seq"]
+    timestamp = datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+    records = [
+        dict({"seq": first_seq + i, "ts": timestamp}, **change)
+        for i, change in enumerate(changes)
+    ]
+
+    last_seq = records[-1]["seq"]
+    segment_path = os.path.join(feed_folder, f"segment_{first_seq:012d}_{last_seq:012d}.{segment_format}")
+
+    # The feed is append-only; never write over a segment that's already there
+    if os.path.exists(segment_path):
+        raise FileExistsError(f"Change feed segment already exists: {segment_path}")
+
+    if segment_format == "parquet":
+
+        import pandas as pd
+
+        table = pd.DataFrame([
+            dict(r, attributes=json.dumps(r["attributes"], default=str), geometry=json.dumps(r["geometry"]))
+            for r in records
+        ])
+
+        table.to_parquet(segment_path + ".tmp", index=False)
+        os.replace(segment_path + ".tmp", segment_path)
+
+    else:
+        write_atomic(segment_path, lambda out_file: out_file.writelines(
+            json.dumps(r, default=str) + "\n" for r in records
+        ))
+
+    # Only move the sequence number along once the segment is safely written
+    write_atomic(
+        os.path.join(feed_folder, "feed_state.json"),
+        lambda out_file: json.dump({"next_seq": last_seq + 1}, out_file),
+    )
+
+    print(f"Wrote {len(records)} changes to the change feed (seq {first_seq}-{last_seq})")
+
+    return [first_seq, last_seq]
+
+########## ########## ########## ########## ########## ##########
+
+# # Reading
+
+# Segments in the feed folder, in order: [(first seq, last seq, path), ...]
+def list_segments(feed_folder):
+
+    segments = []
+
+    for file_name in os.listdir(feed_folder) if os.path.isdir(feed_folder) else []:
+
+        name, _, extension = file_name.partition(".")
+
+        if not name.startswith("segment_") or extension not in ("jsonl", "parquet"):
+            continue
+
+        first_seq, last_seq = (int(n) for n in name.split("_")[1:3])
+        segments.append((first_seq, last_seq, os.path.join(feed_folder, file_name)))
+
+    return sorted(segments)
+
+
+def read_segment(segment_path):
+
+    if segment_path.endswith(".parquet"):
+
+        import pandas as pd
+
+        records = pd.read_parquet(segment_path).to_dict("records")
+
+        for r in records:
+            r["seq"] = int(r["seq"])
+            r["attributes"] = json.loads(r["attributes"])
+            r["geometry"] = json.loads(r["geometry"])
+
+        return records
+
+    with open(segment_path, encoding="utf-8") as segment_file:
+        return [json.loads(line) for line in segment_file if line.strip()]
+
+
+# Everything in the feed after a consumer's cursor (0 = from the very beginning),
+# optionally only for some layers and/or at most limit records at a time.
+# Sends back [list of change records, new cursor]; save the new cursor and pass it next time.
+# Segments that end at or before the cursor are never even opened.
+def read_changes(feed_folder, cursor=0, limit=None, layers=None):
+
+    changes = []
+    new_cursor = cursor
+
+    for first_seq, last_seq, segment_path in list_segments(feed_folder):
+
+        if last_seq <= cursor:
+            continue
+
+        for record in read_segment(segment_path):
+
+            if record["seq"] <= cursor:
+                continue
+
+            if limit is not None and len(changes) >= limit:
+                return [changes, new_cursor]
+
+            new_cursor = record["seq"]
+
+            if layers is None or record["layer"] in layers:
+                changes.append(record)
+
+    return [changes, new_cursor]
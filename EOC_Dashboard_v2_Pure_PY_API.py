@@ -6,6 +6,12 @@ gis = GIS("home")
 from arcgis.features import FeatureLayer
 from arcgis.features import analysis
 
+# Change feed of adds/deletes for downstream consumers (EOC_Change_Feed.py in the same folder)
+from EOC_Change_Feed import append_changes, feature_change, successful_adds, successful_deletes, successful_updates
+
+# Re-issued warnings are matched up by their VTEC event (EOC_VTEC.py in the same folder)
+from EOC_VTEC import add_event_key_field, plan_event_edits, stored_event_key
+
 ########## ########## ########## ########## ########## ##########
 
 # # Parameters
@@ -27,11 +33,27 @@ sc_hist = gis.content.get("c6ffe9f306d047be9b5eeebf3e2bc90e").layers[0]
 # Historical (up to 1 year) archive of NWS Watches and Warnings (EXTREME only)
 nws_hist = gis.content.get("9067bc60433644998c9d5fde97af36fd").layers[0]
 
+# Folder for the change feed (adds to/deletes from the historical layers) and its format:
+# "jsonl" or "parquet". Downstream scripts read it with EOC_Change_Feed.read_changes()
+change_feed_folder = "/arcgis/home/EOC_Change_Feed"
+change_feed_format = "jsonl"
+
+# Changes made this run, written to the feed at the very end
+changes = []
+
+# Field in NWS Historical and Impacted Historical with the event key each row went in under
+# (see EOC_VTEC.py); gets added to the layers if it isn't there yet
+hist_key_field = "Event_Key"
+
 ########## ########## ########## ########## ########## ##########
 
 # # Clear out previous Impacted Live features
 sc_live.delete_features(where="1=1")
 
+# # Make Sure the Historical Layers Have the Event Key Field
+add_event_key_field(nws_hist, hist_key_field)
+add_event_key_field(sc_hist, hist_key_field)
+
 ########## ########## ########## ########## ########## ##########
 
 # Get list of features currently in NWS Watches Warnings (Extreme) live feed
@@ -50,20 +72,31 @@ if nws_feats:
 ########## ########## ########## ########## ########## ##########
 
 # # Update NWS Watches Warnings (Historical) Layer
+# Keyed on the warning's VTEC event rather than Uid (see EOC_VTEC.py): a new event gets added,
+# a re-issued product for an event that's already there updates that row in place
 if nws_feats:
 
-    # List of Uids from NWS Watches and Warnings (historical hosted)
-    nws_hist_ids = [i.attributes["Uid"] for i in nws_hist.query().features]
+    # Everything in NWS Watches and Warnings (historical hosted); attributes only, no geometry
+    nws_hist_feats = nws_hist.query(return_geometry=False).features
 
-    # Construct list of features that are NOT already in NWS Hist layer
-    nws_feats_new = [n for n in nws_feats if not n.attributes["Uid"] in nws_hist_ids]
+    # Sort current features into new events (adds) and re-issued events (updates)
+    nws_adds, nws_updates = plan_event_edits(
+        nws_feats, nws_hist_feats, "Uid", nws_hist.properties.objectIdField, key_field=hist_key_field
+    )
 
     print(f"Features in current NWS Live: {len(nws_feats)}")
-    print(f"Features in NWS not already in Historical: {len(nws_feats_new)}")
-
-    # Cram the trimmed list of Features into NWS Historical layer
-    if nws_feats_new:
-        update_nws_hist = nws_hist.edit_features(adds=nws_feats_new)
+    print(f"Events in NWS not already in Historical: {len(nws_adds)}")
+    print(f"Events in NWS re-issued since they went in Historical: {len(nws_updates)}")
+
+    # Cram the new events into NWS Historical layer and rewrite the re-issued ones
+    if nws_adds or nws_updates:
+        update_nws_hist = nws_hist.edit_features(adds=list(nws_adds.values()), updates=list(nws_updates.values()))
+
+        # Log the ones that made it in for the change feed
+        changes += [feature_change("add", "nws_hist", k, n)
+                    for k, n in successful_adds(list(nws_adds.items()), update_nws_hist)]
+        changes += [feature_change("update", "nws_hist", k, n)
+                    for k, n in successful_updates(list(nws_updates.items()), update_nws_hist)]
     else:
         update_nws_hist = "No features to add to NWS Historical layer"
 
@@ -89,54 +122,70 @@ if nws_feats:
 # that have not already been added to the output previously, 
 # not ALL new analysis output!). 
 # Therefore we must construct a new unique key by concatenating 
-# each ID field from the service centers and nws layers.
+# the service center ID and the NWS event key (VTEC event, or Uid; see EOC_VTEC.py),
+# so a re-issued warning updates the rows for its service centers instead of adding more.
 if nws_feats:
 
-    # Empty list to store keys
-    unikeys= []
-
-    # iterate through Features in FeatureSet returned by query
-    # grab values from 2 guid fields I want, smash together, pop in list
-    for ft in sc_hist.query().features:
-        scid = ft.attributes["Site_ID"]
-        nwsid = ft.attributes["Uid"]
-        ky = f"{scid}|{nwsid}"
-        unikeys.append(ky)
+    # Everything in Impacted Historical; attributes only, no geometry
+    sc_hist_feats = sc_hist.query(return_geometry=False).features
 
     # For testing
-    print(f"Number of unique composite keys: {len(unikeys)}")
+    print(f"Number of rows in Impacted Historical: {len(sc_hist_feats)}")
 
     ########## ########## ########## ########## ########## ##########
     
-    # Make Dictionary of Feature: Key Pairs for Analysis Output
-
-    # Empty dictionary to store Feature: Composite Key pairs from output analysis
-    scnws_dict = {}
+    #Create Lists of Adds and Updates and Update Impacted Historical
 
-    # Iterate through Features derived from FeatureCollection;
-    # Construct composite SiteID+Uid key and chuck pair in dictionary
-    for sn in sc_nws.query().features:
-        scid = sn.attributes["Site_ID"]
-        nwsid = sn.attributes["Uid"]
-        ky = f"{scid}|{nwsid}"
-        scnws_dict[sn] = ky
+    sc_nws_feats = sc_nws.query().features
 
-    ########## ########## ########## ########## ########## ##########
-    
-    #Create List of Adds and Update Impacted Historical
+    scnws_adds, scnws_updates = plan_event_edits(
+        sc_nws_feats, sc_hist_feats, "Uid", sc_hist.properties.objectIdField, site_field="Site_ID",
+        key_field=hist_key_field,
+    )
 
-    scnws_adds = [k for k, v in scnws_dict.items() if not v in unikeys]
-
-    print(f"Number of potential SC adds: {len(scnws_dict.keys())}")
+    print(f"Number of potential SC adds: {len(sc_nws_feats)}")
     print(f"Number of actual SC adds: {len(scnws_adds)}")
+    print(f"Number of SC updates: {len(scnws_updates)}")
+
+    update_sc_live = sc_hist.edit_features(adds=list(scnws_adds.values()), updates=list(scnws_updates.values()))
 
-    update_sc_live = sc_hist.edit_features(adds=scnws_adds)
+    # Log the ones that made it in for the change feed
+    changes += [feature_change("add", "sc_hist", k, s)
+                for k, s in successful_adds(list(scnws_adds.items()), update_sc_live)]
+    changes += [feature_change("update", "sc_hist", k, s)
+                for k, s in successful_updates(list(scnws_updates.items()), update_sc_live)]
 
 ########## ########## ########## ########## ########## ##########
 
 # # Delete all rows in Impacted Historical and NWS Older than 100 Days
-sc_hist.delete_features(where="End_ <= CURRENT_TIMESTAMP - 100")
-nws_hist.delete_features(where="End_ <= CURRENT_TIMESTAMP - 100")
+# Grab what's about to go first (no geometry, just the attributes the keys come from) for the change feed,
+# then delete exactly those rows by ObjectID, so the feed and the delete always cover the same rows
+# (anything that ages out in between just goes next run)
+retention_query = "End_ <= CURRENT_TIMESTAMP - 100"
+
+sc_hist_expired = sc_hist.query(where=retention_query, return_geometry=False).features
+nws_hist_expired = nws_hist.query(where=retention_query, return_geometry=False).features
+
+if sc_hist_expired:
+    sc_hist_oid = sc_hist.properties.objectIdField
+    delete_sc_hist = sc_hist.delete_features(deletes=",".join(str(f.attributes[sc_hist_oid]) for f in sc_hist_expired))
+
+    changes += [feature_change("delete", "sc_hist",
+                               f"{f.attributes['Site_ID']}|{stored_event_key(f, 'Uid', key_field=hist_key_field)}", f)
+                for f in successful_deletes(sc_hist_expired, delete_sc_hist, sc_hist_oid)]
+
+if nws_hist_expired:
+    nws_hist_oid = nws_hist.properties.objectIdField
+    delete_nws_hist = nws_hist.delete_features(deletes=",".join(str(f.attributes[nws_hist_oid]) for f in nws_hist_expired))
+
+    changes += [feature_change("delete", "nws_hist", stored_event_key(f, "Uid", key_field=hist_key_field), f)
+                for f in successful_deletes(nws_hist_expired, delete_nws_hist, nws_hist_oid)]
+
+########## ########## ########## ########## ########## ##########
+
+# # Write This Run's Changes to the Change Feed
+# One new segment per run; nothing gets written if nothing changed
+append_changes(change_feed_folder, changes, change_feed_format)
 
 ########## ########## ########## ########## ########## ##########
 
@@ -0,0 +1,254 @@
+# # EOC Historical Backfill
+
+# Rebuild NWS Historical (nws_hist) and Impacted Historical (sc_hist) from archived
+# snapshots of the NWS Watches and Warnings feed, instead of waiting months of live runs
+# to fill them back up (new Enterprise deployment, schema change, lowercase field migration...).
+
+# Gives the same result as if the EOC Dashboard notebook had run once per snapshot,
+# oldest first, but does it all in memory in one go:
+#   1. read every snapshot in time order; keep the FIRST version of each product (Uid) seen,
+#      for the same events the live notebook for the deployment (AGOL or Enterprise) queries for
+#   2. collapse re-issued products into one event each, latest product wins (EOC_VTEC.py)
+#   3. skip events the 100-day retention delete would throw out anyway
+#   4. run the Service Centers x NWS overlay on every product at once (in big chunks)
+#   5. dedupe by event key (nws_hist) and Site_ID|event key composite key (sc_hist), against each other
+#      AND against whatever is already in the historical layers, so it's safe to re-run
+#   6. bulk load what's left into the historical layers, a chunk of edits at a time
+#      (new events get added, events already there get updated in place)
+# Every add and update goes in the change feed, same as the live notebooks.
+
+# Snapshots are what nws.query(...).to_dict() gives back (or the raw REST query JSON),
+# one file per snapshot, .json or .json.gz, named so they sort oldest first
+# (e.g. NWS_20240512T2100Z.json).
+
+# # Imports
+
+from arcgis.gis import GIS
+gis = GIS("home")
+
+from arcgis.features import analysis
+
+import gzip
+import json
+import os
+import time
+
+# Change feed of adds/deletes for downstream consumers (EOC_Change_Feed.py in the same folder)
+from EOC_Change_Feed import append_changes, feature_change, successful_adds, successful_updates
+
+# Re-issued warnings are matched up by their VTEC event (EOC_VTEC.py in the same folder)
+from EOC_VTEC import add_event_key_field, event_key, plan_event_edits, starts_event
+
+########## ########## ########## ########## ########## ##########
+
+# # Parameters
+
+# Folder of archived NWS Watches and Warnings snapshots
+snapshot_folder = "/arcgis/home/NWS_Snapshots"
+
+# Same as the live notebook's retention delete (End_ <= CURRENT_TIMESTAMP - 100)
+retention_days = 100
+
+# USDA Service Centers, Impacted Historical and NWS Historical.
+# For Enterprise, use the layers from EOC_Dashboard_v2_Pure_Py_API_Enterprise.py
+# and set lowercase_fields = True (Enterprise layers have all-lowercase field names)
+sc = gis.content.get("beb041443237439e97853c3cb04febd7").layers[0]
+sc_hist = gis.content.get("c6ffe9f306d047be9b5eeebf3e2bc90e").layers[0]
+nws_hist = gis.content.get("9067bc60433644998c9d5fde97af36fd").layers[0]
+
+lowercase_fields = False
+
+# Same events the live notebook for the deployment queries for
+# (the Enterprise notebook also takes Tornado Watch and Flood Warning)
+if lowercase_fields:
+    events = ["Tornado Warning", "Tornado Watch", "Flood Warning", "Flash Flood Warning", "Hurricane Warning", "Fire Warning"]
+else:
+    events = ["Tornado Warning", "Flash Flood Warning", "Hurricane Warning", "Fire Warning"]
+
+# NWS features per overlay_layers call, and features per edit_features call
+overlay_chunk_size = 2000
+edit_chunk_size = 1000
+
+# Folder for the change feed and its format ("jsonl" or "parquet"); same as the live notebooks
+change_feed_folder = "/arcgis/home/EOC_Change_Feed"
+change_feed_format = "jsonl"
+
+# Changes made by the backfill, written to the feed at the very end
+changes = []
+
+# Key fields, depending on which flavor of field names the layers have
+uid_field = "uid" if lowercase_fields else "Uid"
+site_field = "site_id" if lowercase_fields else "Site_ID"
+key_field = "event_key" if lowercase_fields else "Event_Key"
+
+########## ########## ########## ########## ########## ##########
+
+# # Functions
+
+# Snapshot files in the folder, oldest first (by name)
+def list_snapshots(folder):
+
+    return sorted(
+        os.path.join(folder, f) for f in os.listdir(folder)
+        if f.endswith(".json") or f.endswith(".json.gz")
+    )
+
+
+def read_snapshot(snapshot_path):
+
+    open_snapshot = gzip.open if snapshot_path.endswith(".gz") else open
+
+    with open_snapshot(snapshot_path, "rt", encoding="utf-8") as snapshot_file:
+        return json.load(snapshot_file)
+
+
+# Same thing the Enterprise notebook does to the live NWS features:
+# proper-case field names to lowercase, geometry left alone
+def lowercase_feature(feature):
+
+    return dict(feature, attributes={k.lower(): v for k, v in feature["attributes"].items()})
+
+
+def lowercase_field(field):
+
+    return dict(field, name=field["name"].lower())
+
+
+# Split a list up into lists of at most size items
+def chunks(items, size):
+
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+# Add and update features in a historical layer a chunk at a time and log what made it in.
+# adds and updates are dictionaries of key: feature (key is what goes in the change feed)
+def bulk_edit(layer, layer_name, adds, updates):
+
+    for op, keyed_features, results in [("add", adds, successful_adds), ("update", updates, successful_updates)]:
+
+        done = 0
+
+        for chunk in chunks(list(keyed_features.items()), edit_chunk_size):
+
+            edits = [f for k, f in chunk]
+            edit_result = layer.edit_features(adds=edits) if op == "add" else layer.edit_features(updates=edits)
+
+            for k, f in results(chunk, edit_result):
+                changes.append(feature_change(op, layer_name, k, f))
+                done += 1
+
+        print(f"{op.title()}: {done} of {len(keyed_features)} features in {layer_name}")
+
+########## ########## ########## ########## ########## ##########
+
+# # Read Every Snapshot, Oldest First
+start = time.perf_counter()
+
+# Anything that ended before this (epoch milliseconds, like End_) is past retention
+cutoff = (time.time() - retention_days * 86400) * 1000
+
+# Uid: first version of the product seen
+nws_products = {}
+
+# Everything in a snapshot except the features (fields, geometry type, spatial reference)
+nws_header = {}
+
+snapshot_paths = list_snapshots(snapshot_folder)
+
+for snapshot_path in snapshot_paths:
+
+    snapshot = read_snapshot(snapshot_path)
+
+    if not nws_header and snapshot.get("fields"):
+        nws_header = {k: v for k, v in snapshot.items() if k != "features"}
+
+    for feature in snapshot.get("features", []):
+
+        attributes = feature["attributes"]
+
+        if attributes.get("Event") in events:
+            nws_products.setdefault(attributes["Uid"], feature)
+
+# Events started by a product in the snapshots; follow-up products match up with these
+# (see EOC_VTEC.py for why the year needs the help)
+known_events = {event_key(f, "Uid") for f in nws_products.values() if starts_event(f)}
+
+# Event key: latest product for the event (products are in the order they first showed up),
+# and Uid: event key for every product
+nws_events = {}
+product_events = {}
+
+for uid, feature in nws_products.items():
+    product_events[uid] = event_key(feature, "Uid", known_events)
+    nws_events[product_events[uid]] = feature
+
+# Drop events whose latest product ended before the retention cutoff, and all their products
+expired = {
+    k for k, f in nws_events.items()
+    if isinstance(f["attributes"].get("End_"), (int, float)) and f["attributes"]["End_"] <= cutoff
+}
+
+nws_events = {k: f for k, f in nws_events.items() if k not in expired}
+nws_products = {k: f for k, f in nws_products.items() if product_events[k] not in expired}
+
+print(f"Read {len(snapshot_paths)} snapshots: {len(nws_products)} distinct NWS products, "
+      f"{len(nws_events)} events inside retention")
+
+# Lowercase everything for Enterprise (see EOC_Dashboard_v2_Pure_Py_API_Enterprise.py for why)
+if lowercase_fields:
+    nws_products = {k: lowercase_feature(f) for k, f in nws_products.items()}
+    nws_events = {k: lowercase_feature(f) for k, f in nws_events.items()}
+    nws_header["fields"] = [lowercase_field(f) for f in nws_header.get("fields", [])]
+
+########## ########## ########## ########## ########## ##########
+
+# # Perform Overlay Analysis: Service Centers X Every NWS Product At Once
+# Every product, not just the latest per event, so service centers inside an earlier
+# (bigger) polygon still show up, just like they would have in the live runs.
+# Tolerance is in meters, unit of layer. 8K meters roughly 5 miles.
+# Overlay is feature by feature, so chunking doesn't change the answer.
+sc_nws_feats = []
+
+for chunk in chunks(list(nws_products.values()), overlay_chunk_size):
+    sc_nws = analysis.overlay_layers(sc, dict(nws_header, features=chunk), tolerance=8000)
+    sc_nws_feats += sc_nws.query().features
+
+print(f"Overlay found {len(sc_nws_feats)} Service Center x NWS features")
+
+########## ########## ########## ########## ########## ##########
+
+# # Dedupe Against What's Already In the Historical Layers
+# Attributes only, no geometry; much lighter than pulling the whole layers.
+# Every row gets the event key it went in under (see EOC_VTEC.py), so make sure the field's there
+
+add_event_key_field(nws_hist, key_field)
+add_event_key_field(sc_hist, key_field)
+
+nws_hist_feats = nws_hist.query(return_geometry=False).features
+sc_hist_feats = sc_hist.query(return_geometry=False).features
+
+nws_adds, nws_updates = plan_event_edits(
+    list(nws_events.values()), nws_hist_feats, uid_field, nws_hist.properties.objectIdField, key_field=key_field,
+)
+
+# Same composite key as the live notebook; latest product for each service center wins
+scnws_adds, scnws_updates = plan_event_edits(
+    sc_nws_feats, sc_hist_feats, uid_field, sc_hist.properties.objectIdField, site_field=site_field,
+    key_field=key_field,
+)
+
+print(f"NWS events: {len(nws_adds)} to add, {len(nws_updates)} to update")
+print(f"SC features: {len(scnws_adds)} to add, {len(scnws_updates)} to update")
+
+########## ########## ########## ########## ########## ##########
+
+# # Bulk Load the Historical Layers
+bulk_edit(nws_hist, "nws_hist", nws_adds, nws_updates)
+bulk_edit(sc_hist, "sc_hist", scnws_adds, scnws_updates)
+
+########## ########## ########## ########## ########## ##########
+
+# # Write the Backfill's Changes to the Change Feed
+append_changes(change_feed_folder, changes, change_feed_format)
+
+print(f"Backfill finished in {time.perf_counter() - start:.1f} seconds")
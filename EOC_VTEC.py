@@ -0,0 +1,245 @@
+# # EOC VTEC Events
+
+# NWS re-issues the same warning over and over (continued, extended, polygon redrawn, cancelled
+# early...), and every product gets a brand new Uid. Keyed on Uid, nws_hist and sc_hist
+# pile up a near-duplicate row for every one of those products, even though it's all ONE event.
+
+# Every product for one event carries the same P-VTEC event identity:
+#     /O.CON.KBOU.TO.W.0012.240512T2100Z-240512T2145Z/
+#        action . office . phenomenon . significance . event tracking number (ETN) . begin-end
+# ETNs start over every year, so event key = office.phenomenon.significance.ETN.year
+#     KBOU.TO.W.0012.2024
+# The year is the year the event was ISSUED (that's what the ETN belongs to). Only the product
+# that starts the event has a begin time; follow-ups (CON, EXT, CAN...) have 000000T0000Z there.
+# A follow-up ending in January may belong to an event issued last year (one issued Dec 31 at
+# 11 PM that runs past midnight), so it matches whichever of the two years is already known
+# (in the layer, or earlier in the same batch) instead of splitting the event in two.
+# The notebooks key on that instead of Uid: the first product for an event gets added,
+# later products UPDATE that row in place (geometry, End_, everything else) instead of adding more.
+# The key a row was added under is written to its own field (event_key_field) and read back from
+# there, NOT worked out again from whatever product the row holds now: after an update the row holds
+# a follow-up, and the follow-up alone can't always say which year the event was issued in.
+# Rows added before the field existed fall back to working it out from their VTEC string.
+
+# Only storm-based warnings get consolidated (consolidate_phenomena): by NWS policy those are
+# one polygon per event. Zone/county-based products (hurricane warnings, watches...) can have
+# several features with the same VTEC event at once, one per area, so those stay keyed on Uid.
+# Anything without a VTEC string in vtec_fields also just stays keyed on Uid (same as before).
+
+# This file needs to sit next to the notebooks (e.g. in /arcgis/home) so they can import it.
+
+import re
+
+########## ########## ########## ########## ########## ##########
+
+# # Settings
+
+# Attribute fields that may hold the VTEC string (first one with a match wins; case doesn't matter).
+# The string comes from the VTEC parameter of the NWS CAP alert (properties.parameters.VTEC on
+# api.weather.gov), so a layer that carries it has it in a field named VTEC. Summary and Link are
+# only a fallback for feeds that paste it into the text. If the NWS layer doesn't carry it at all,
+# every feature stays keyed on Uid: plan_event_edits prints how many features that happened to.
+vtec_fields = ["VTEC", "Summary", "Link"]
+
+# phenomenon.significance of the storm-based (one polygon per event) warnings:
+# tornado, severe thunderstorm, flash flood, extreme wind, snow squall, special marine
+consolidate_phenomena = {"TO.W", "SV.W", "FF.W", "EW.W", "SQ.W", "MA.W"}
+
+# Field in nws_hist and sc_hist the event key gets written to (string); added to the layer if it's
+# missing (add_event_key_field). All-lowercase layers (Enterprise) use "event_key".
+event_key_field = "Event_Key"
+
+# Field with when the product was issued/updated; between two products for the same event,
+# the later one wins (if it's missing, whichever comes later in the list wins)
+updated_field = "Updated"
+
+# office, phenomenon, significance, ETN, begin, end
+vtec_pattern = re.compile(
+    r"/[OTEX]\.[A-Z]{3}\.([A-Z]{4})\.([A-Z]{2})\.([A-Z])\.(\d{4})\.(\d{6}T\d{4}Z)-(\d{6}T\d{4}Z)/"
+)
+
+########## ########## ########## ########## ########## ##########
+
+# # Event Keys
+
+# Attributes of a Feature or feature dictionary, with lowercase field names
+# (so the same code works for the proper-case AGOL and all-lowercase Enterprise layers)
+def lower_attributes(feature):
+
+    attributes = feature["attributes"] if isinstance(feature, dict) else feature.attributes
+
+    return {k.lower(): v for k, v in attributes.items()}
+
+
+# Pull the VTEC event identity out of a feature's attributes; None if there isn't one
+# Sends back [office, phenomenon, significance, ETN, begin, end]
+def parse_vtec(attributes):
+
+    for field in vtec_fields:
+
+        value = attributes.get(field.lower())
+        match = vtec_pattern.search(value) if isinstance(value, str) else None
+
+        if match:
+            return list(match.groups())
+
+    return None
+
+
+# Years the event could have been issued in, most likely first.
+# The product that starts the event says so itself (begin time); a follow-up only has its end time,
+# and storm-based warnings last hours, so only one ending in January can go back a year
+def event_years(vtec):
+
+    begin, end = vtec[4:]
+
+    if not begin.startswith("000000"):
+        return [f"20{begin[:2]}"]
+
+    if end.startswith("000000"):
+        return [""]
+
+    year = int(f"20{end[:2]}")
+
+    return [str(year), str(year - 1)] if end[2:4] == "01" else [str(year)]
+
+
+# Is this the product that starts its event (the one with a begin time)?
+def starts_event(feature):
+
+    vtec = parse_vtec(lower_attributes(feature))
+
+    return bool(vtec) and not vtec[4].startswith("000000")
+
+
+# Event key for one NWS feature (or anything carrying its attributes, like the overlay output):
+# office.phenomenon.significance.ETN.year for storm-based warnings, otherwise the Uid.
+# known_events is the event keys already seen; a follow-up product whose year is in doubt
+# goes with the one of its possible years that's already known.
+def event_key(feature, uid_field, known_events=()):
+
+    attributes = lower_attributes(feature)
+    vtec = parse_vtec(attributes)
+
+    if vtec and f"{vtec[1]}.{vtec[2]}" in consolidate_phenomena:
+        keys = [".".join(vtec[:4] + ([year] if year else [])) for year in event_years(vtec)]
+        return next((k for k in keys if k in known_events), keys[0])
+
+    return attributes[uid_field.lower()]
+
+
+# Event key a historical row was recorded under: what's in the event key field,
+# or worked out from the row's VTEC string for rows from before that field existed
+def stored_event_key(feature, uid_field, known_events=(), key_field=event_key_field):
+
+    stored = lower_attributes(feature).get(key_field.lower())
+
+    return stored if stored else event_key(feature, uid_field, known_events)
+
+
+# Add the event key field to a historical layer if it isn't there yet
+def add_event_key_field(layer, key_field=event_key_field):
+
+    if key_field.lower() in {f["name"].lower() for f in layer.properties.fields}:
+        return
+
+    layer.manager.add_to_definition({"fields": [{
+        "name": key_field, "alias": "Event Key", "type": "esriFieldTypeString",
+        "length": 64, "nullable": True, "editable": True,
+    }]})
+
+########## ########## ########## ########## ########## ##########
+
+# # Adds and Updates
+
+# Is this product newer than the one already picked for the same event?
+def is_newer(feature, other):
+
+    updated = lower_attributes(feature).get(updated_field.lower())
+    other_updated = lower_attributes(other).get(updated_field.lower())
+
+    if updated is None or other_updated is None:
+        return True
+
+    return updated >= other_updated
+
+
+# Feature as a dictionary with some attributes changed or added
+# (event key for edit_features(adds=...), plus the ObjectID of the row for updates=...)
+def with_attributes(feature, **attributes):
+
+    feature_dict = dict(feature) if isinstance(feature, dict) else feature.as_dict
+
+    return dict(feature_dict, attributes=dict(feature_dict["attributes"], **attributes))
+
+
+# Key to dedupe on for every feature: the event key, or site|event key when site_field is given
+# (Impacted Historical), along with the event key on its own. Products that start an event go first,
+# so their year is known by the time the follow-ups are keyed; known_events picks up every event
+# along the way. Rows already in a historical layer (stored=True) use the key they were recorded under.
+def feature_keys(features, uid_field, site_field, known_events, stored=False, key_field=event_key_field):
+
+    keys = []
+
+    for feature in sorted(features, key=lambda f: not starts_event(f)):
+
+        if stored:
+            event = stored_event_key(feature, uid_field, known_events, key_field)
+        else:
+            event = event_key(feature, uid_field, known_events)
+
+        known_events.add(event)
+
+        if site_field:
+            keys.append((f"{lower_attributes(feature)[site_field.lower()]}|{event}", event, feature))
+        else:
+            keys.append((event, event, feature))
+
+    return keys
+
+
+# Work out what to do with a batch of new features against what's already in a historical layer,
+# deduping on the event key (site_field=None, NWS Historical) or site|event key (Impacted Historical).
+# Between features with the same key, the newest product wins. Then:
+#   - key not in the layer yet: add it
+#   - key already in the layer from a different product (different Uid): update that row in place
+#   - same product as what's there already: nothing to do
+# Adds and updates both get the event key written to key_field, and an update keeps the event key
+# the row already has, so the row stays on the year its event was issued in.
+# Sends back [dictionary of key: add feature dictionary, dictionary of key: update feature dictionary]
+def plan_event_edits(features, hist_features, uid_field, oid_field, site_field=None, key_field=event_key_field):
+
+    # Features that will stay keyed on Uid because no VTEC string turned up in vtec_fields
+    no_vtec = sum(1 for f in features if parse_vtec(lower_attributes(f)) is None)
+
+    if no_vtec:
+        print(f"{no_vtec} of {len(features)} features have no VTEC string in {vtec_fields}, "
+              f"keyed on {uid_field} instead")
+
+    known_events = set()
+
+    # Key: (ObjectID, Uid, event key) of the row already in the layer
+    existing = {
+        key: (h.attributes[oid_field], lower_attributes(h).get(uid_field.lower()), event)
+        for key, event, h in feature_keys(hist_features, uid_field, site_field, known_events, True, key_field)
+    }
+
+    latest = {}
+
+    for key, event, feature in feature_keys(features, uid_field, site_field, known_events):
+
+        if key not in latest or is_newer(feature, latest[key][1]):
+            latest[key] = (event, feature)
+
+    adds = {}
+    updates = {}
+
+    for key, (event, feature) in latest.items():
+
+        if key not in existing:
+            adds[key] = with_attributes(feature, **{key_field: event})
+
+        elif existing[key][1] != lower_attributes(feature)[uid_field.lower()]:
+            updates[key] = with_attributes(feature, **{key_field: existing[key][2], oid_field: existing[key][0]})
+
+    return [adds, updates]
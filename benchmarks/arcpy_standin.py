@@ -0,0 +1,608 @@
+
+############################################################
+# ARCPY STAND-IN
+############################################################
+
+# Just enough of arcpy to run ArcGIS_Pro_Notebook_Map_Automation.py without
+# a licensed ArcGIS Pro session, for benchmarking. Everything lives in memory:
+# "feature classes" are columns of attributes plus a bounding box per feature,
+# and all the spatial stuff (intersect, within a distance) is done on those boxes.
+# That's nowhere near real geometry, but it's the same SHAPE of work
+# (same cursors, same selections, same number of rows), which is what the
+# benchmark is after: which step dominates, and did something get slower.
+
+# Only the pieces of arcpy the map script actually touches are here.
+# Install it with install() BEFORE importing the map script, so "import arcpy" finds it.
+# Load data with load_synthetic_dataset().
+
+import os
+import re
+import sys
+import types
+import numpy as np
+
+
+# Every "feature class" by path, every project by path, every layer made by MakeFeatureLayer by name
+datasets = {}
+projects = {}
+named_layers = {}
+
+
+############################################################
+# GEOMETRY, EXTENTS, SPATIAL REFERENCES
+############################################################
+
+class SpatialReference:
+
+    def __init__(self, code=3857):
+        self.factoryCode = code
+        self.type = "Geographic" if code in (4269, 4326) else "Projected"
+        self.metersPerUnit = 1.0 if self.type == "Projected" else None
+
+
+class Extent:
+
+    def __init__(self, XMin=None, YMin=None, XMax=None, YMax=None, *args, spatial_reference=None):
+        self.XMin, self.YMin, self.XMax, self.YMax = XMin, YMin, XMax, YMax
+        self.spatialReference = spatial_reference
+
+    @property
+    def width(self):
+        return self.XMax - self.XMin
+
+    @property
+    def height(self):
+        return self.YMax - self.YMin
+
+    def __str__(self):
+        return f"{self.XMin} {self.YMin} {self.XMax} {self.YMax} NaN NaN NaN NaN"
+
+
+# A "polygon" is just its bounding box here
+class Geometry:
+
+    def __init__(self, box):
+        self.extent = Extent(*[float(v) for v in box])
+
+
+############################################################
+# FEATURE CLASSES AND LAYERS
+############################################################
+
+class Field:
+
+    def __init__(self, name, field_type):
+        self.name = name
+        self.type = field_type
+
+
+# A feature class: ObjectIDs, one bounding box per feature, and attribute columns
+class Dataset:
+
+    def __init__(self, fields, columns, boxes):
+        self.fields = [Field("OBJECTID", "OID"), Field("Shape", "Geometry")] + [Field(n, t) for n, t in fields]
+        self.columns = {name: list(values) for name, values in columns.items()}
+        self.boxes = np.asarray(boxes, dtype=np.float64)
+        self.oids = np.arange(1, len(self.boxes) + 1)
+
+    def copy(self):
+        return Dataset(
+            [(f.name, f.type) for f in self.fields[2:]],
+            self.columns,
+            self.boxes.copy(),
+        )
+
+
+class Layer:
+
+    def __init__(self, name, data_source, definition_query=None):
+        self.name = name
+        self.dataSource = data_source
+        self.definitionQuery = definition_query
+        self.selection = None
+
+    @property
+    def connectionProperties(self):
+        return {
+            "connection_info": {"database": os.path.dirname(self.dataSource)},
+            "dataset": os.path.basename(self.dataSource),
+            "workspace_factory": "File Geodatabase",
+        }
+
+    def updateConnectionProperties(self, current, new):
+        self.dataSource = os.path.join(new["connection_info"]["database"], new["dataset"])
+        self.selection = None
+
+    @property
+    def dataset(self):
+        return datasets[self.dataSource]
+
+
+# Whatever gets handed to a tool or cursor (layer object, MakeFeatureLayer name,
+# or feature class path) as a layer
+def as_layer(in_data):
+
+    if isinstance(in_data, Layer):
+        return in_data
+
+    if in_data in named_layers:
+        return named_layers[in_data]
+
+    return Layer(os.path.basename(in_data), in_data)
+
+
+############################################################
+# WHERE CLAUSES
+############################################################
+
+# The map script only ever builds  FIELD = 'value'  and  FIELD IN ('a', 'b')
+where_equals = re.compile(r"^\s*(\w+)\s*=\s*'([^']*)'\s*$")
+where_in = re.compile(r"^\s*(\w+)\s+IN\s*\((.*)\)\s*$", re.IGNORECASE)
+
+
+def where_mask(dataset, where_clause):
+
+    if not where_clause:
+        return np.ones(len(dataset.oids), dtype=bool)
+
+    match = where_equals.match(where_clause)
+
+    if match:
+        field, value = match.groups()
+        return np.array([v == value for v in dataset.columns[field]], dtype=bool)
+
+    match = where_in.match(where_clause)
+
+    if match:
+        field, values = match.groups()
+        values = set(re.findall(r"'([^']*)'", values))
+        return np.array([v in values for v in dataset.columns[field]], dtype=bool)
+
+    raise ValueError(f"Stand-in can't parse where clause: {where_clause}")
+
+
+# Rows a layer can see: its definition query, then its selection if it has one
+def layer_mask(layer):
+
+    mask = where_mask(layer.dataset, layer.definitionQuery)
+
+    if layer.selection is not None and layer.selection.any():
+        mask = mask & layer.selection
+
+    return mask
+
+
+############################################################
+# CURSORS
+############################################################
+
+class SearchCursor:
+
+    def __init__(self, in_table, field_names, where_clause=None, spatial_reference=None, **kwargs):
+        self.layer = as_layer(in_table)
+        self.dataset = self.layer.dataset
+        self.fields = [field_names] if isinstance(field_names, str) else list(field_names)
+        mask = layer_mask(self.layer) & where_mask(self.dataset, where_clause)
+        self.indexes = np.flatnonzero(mask).tolist()
+
+    def value(self, index, field):
+        if field in ("OID@", "OBJECTID"):
+            return int(self.dataset.oids[index])
+        if field == "SHAPE@":
+            return Geometry(self.dataset.boxes[index])
+        return self.dataset.columns[field][index]
+
+    def __iter__(self):
+        for index in self.indexes:
+            self.current = index
+            yield self.make_row(index)
+
+    def make_row(self, index):
+        return tuple(self.value(index, f) for f in self.fields)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+
+class UpdateCursor(SearchCursor):
+
+    def make_row(self, index):
+        return [self.value(index, f) for f in self.fields]
+
+    def updateRow(self, row):
+        for field, value in zip(self.fields, row):
+            if field not in ("OID@", "OBJECTID", "SHAPE@"):
+                self.dataset.columns[field][self.current] = value
+
+
+da = types.SimpleNamespace(SearchCursor=SearchCursor, UpdateCursor=UpdateCursor)
+
+
+############################################################
+# GEOPROCESSING TOOLS
+############################################################
+
+# Search distances like "5 Miles" in meters
+distance_units = {"meters": 1.0, "kilometers": 1000.0, "miles": 1609.344, "feet": 0.3048}
+
+
+def parse_distance(search_distance):
+
+    if not search_distance:
+        return 0.0
+
+    amount, unit = str(search_distance).split()
+
+    return float(amount) * distance_units[unit.lower()]
+
+
+# Distance from every box in one array to the nearest box in another (0 = touching/overlapping)
+def nearest_box_distance(boxes, other_boxes):
+
+    if not len(other_boxes):
+        return np.full(len(boxes), np.inf)
+
+    dx = np.maximum(0, np.maximum(other_boxes[None, :, 0] - boxes[:, None, 2], boxes[:, None, 0] - other_boxes[None, :, 2]))
+    dy = np.maximum(0, np.maximum(other_boxes[None, :, 1] - boxes[:, None, 3], boxes[:, None, 1] - other_boxes[None, :, 3]))
+
+    return np.sqrt(dx ** 2 + dy ** 2).min(axis=1)
+
+
+def apply_selection(layer, hits, selection_type):
+
+    current = layer.selection if layer.selection is not None else np.zeros(len(layer.dataset.oids), dtype=bool)
+    visible = where_mask(layer.dataset, layer.definitionQuery)
+
+    if selection_type == "ADD_TO_SELECTION":
+        layer.selection = current | hits
+    elif selection_type == "REMOVE_FROM_SELECTION":
+        layer.selection = current & ~hits
+    elif selection_type == "SUBSET_SELECTION":
+        layer.selection = current & hits
+    elif selection_type == "SWITCH_SELECTION":
+        layer.selection = visible & ~current
+    else:
+        layer.selection = hits
+
+    layer.selection &= visible
+
+
+def SelectLayerByAttribute(in_layer_or_view, selection_type="NEW_SELECTION", where_clause=None, *args):
+
+    layer = as_layer(in_layer_or_view)
+
+    if selection_type == "CLEAR_SELECTION":
+        layer.selection = None
+        return
+
+    apply_selection(layer, where_mask(layer.dataset, where_clause), selection_type)
+
+
+def SelectLayerByLocation(in_layer, overlap_type="INTERSECT", select_features=None,
+                          search_distance=None, selection_type="NEW_SELECTION", *args):
+
+    layer = as_layer(in_layer)
+
+    if selection_type == "SWITCH_SELECTION":
+        apply_selection(layer, None, selection_type)
+        return
+
+    select_layer = as_layer(select_features)
+    select_boxes = select_layer.dataset.boxes[layer_mask(select_layer)]
+
+    distance = 0.0 if overlap_type == "INTERSECT" else parse_distance(search_distance)
+
+    hits = nearest_box_distance(layer.dataset.boxes, select_boxes) <= distance
+
+    apply_selection(layer, hits, selection_type)
+
+
+def MakeFeatureLayer(in_features, out_layer, where_clause=None, *args):
+
+    source = as_layer(in_features)
+    named_layers[out_layer] = Layer(out_layer, source.dataSource, where_clause)
+
+
+def CalculateField(in_table, field, expression, *args):
+
+    layer = as_layer(in_table)
+    value = expression.strip("'\"")
+    column = layer.dataset.columns[field]
+
+    for index in np.flatnonzero(layer_mask(layer)):
+        column[index] = value
+
+
+def Delete(in_data, *args):
+
+    named_layers.pop(in_data, None)
+
+    # Deleting a geodatabase takes everything in it along too
+    for path in [p for p in datasets if os.path.dirname(p) == in_data]:
+        del datasets[path]
+
+    if os.path.isdir(in_data):
+        os.rmdir(in_data)
+
+
+def GetCount(in_rows):
+
+    return [str(int(layer_mask(as_layer(in_rows)).sum()))]
+
+
+def CreateFileGDB(out_folder_path, out_name, *args):
+
+    os.makedirs(os.path.join(out_folder_path, out_name), exist_ok=True)
+
+
+def CopyFeatures(in_features, out_feature_class, *args):
+
+    datasets[out_feature_class] = as_layer(in_features).dataset.copy()
+
+
+def AddIndex(in_table, fields, index_name=None, *args):
+
+    pass
+
+
+# Simplifying doesn't move a bounding box much, so the copy is just the same boxes
+def SimplifyPolygon(in_features, out_feature_class, *args):
+
+    datasets[out_feature_class] = as_layer(in_features).dataset.copy()
+
+
+management = types.SimpleNamespace(
+    AddIndex=AddIndex,
+    SelectLayerByAttribute=SelectLayerByAttribute,
+    SelectLayerByLocation=SelectLayerByLocation,
+    MakeFeatureLayer=MakeFeatureLayer,
+    CalculateField=CalculateField,
+    Delete=Delete,
+    GetCount=GetCount,
+    CreateFileGDB=CreateFileGDB,
+    CopyFeatures=CopyFeatures,
+)
+
+cartography = types.SimpleNamespace(
+    SimplifyPolygon=SimplifyPolygon,
+)
+
+
+############################################################
+# EVERYTHING ELSE AT THE TOP OF ARCPY
+############################################################
+
+env = types.SimpleNamespace(workspace=None)
+
+messages = []
+
+
+def AddMessage(message):
+
+    messages.append(message)
+
+
+def AddFieldDelimiters(datasource, field):
+
+    return field
+
+
+def ValidateTableName(name, workspace=None):
+
+    return re.sub(r"\W", "_", name)
+
+
+def Exists(dataset):
+
+    return dataset in datasets or dataset in named_layers or os.path.isdir(dataset)
+
+
+def ListFields(dataset, *args):
+
+    return list(as_layer(dataset).dataset.fields)
+
+
+def Describe(value):
+
+    boxes = as_layer(value).dataset.boxes
+
+    return types.SimpleNamespace(
+        extent=Extent(boxes[:, 0].min(), boxes[:, 1].min(), boxes[:, 2].max(), boxes[:, 3].max())
+    )
+
+
+############################################################
+# PROJECTS, MAPS AND LAYOUTS
+############################################################
+
+class Map:
+
+    def __init__(self, name, layers):
+        self.name = name
+        self.layers = layers
+        self.spatialReference = SpatialReference(3857)
+
+    def listLayers(self, wildcard=None):
+        return [ml for ml in self.layers if wildcard in (None, ml.name)]
+
+
+class Camera:
+
+    def __init__(self, frame):
+        self.frame = frame
+        self.scale = 1.0
+
+    # Fit the extent in the frame: tighter side sets the scale (frame size is in inches)
+    def setExtent(self, extent):
+        self.scale = max(
+            extent.width / (self.frame.elementWidth * 0.0254),
+            extent.height / (self.frame.elementHeight * 0.0254),
+        )
+
+
+class MapFrame:
+
+    type = "MAPFRAME_ELEMENT"
+
+    def __init__(self, name, frame_map, x, y, width, height):
+        self.name = name
+        self.map = frame_map
+        self.elementPositionX, self.elementPositionY = x, y
+        self.elementWidth, self.elementHeight = width, height
+        self.camera = Camera(self)
+
+
+class TextElement:
+
+    type = "TEXT_ELEMENT"
+
+    def __init__(self, name, x, y, width, height):
+        self.name = name
+        self.text = ""
+        self.elementPositionX, self.elementPositionY = x, y
+        self.elementWidth, self.elementHeight = width, height
+
+
+class Layout:
+
+    def __init__(self, name, main_map):
+        self.name = name
+        self.pageWidth, self.pageHeight, self.pageUnits = 11.0, 8.5, "INCH"
+        self.elements = [
+            MapFrame("Main Map", main_map, 0.5, 0.5, 7.5, 7.0),
+            MapFrame("Overview Map", main_map, 8.25, 5.0, 2.5, 2.5),
+            TextElement("Title", 8.25, 4.0, 2.5, 0.5),
+            TextElement("Subtitle", 8.25, 3.5, 2.5, 0.3),
+        ]
+
+    def listElements(self, element_type=None, wildcard=None):
+        return [
+            e for e in self.elements
+            if element_type in (None, e.type) and wildcard in (None, e.name)
+        ]
+
+    # No rendering; just drop a small file where the PDF would go
+    def exportToPDF(self, out_pdf, resolution=96, **kwargs):
+        with open(out_pdf, "w") as pdf_file:
+            pdf_file.write(f"stand-in PDF: {self.listElements('TEXT_ELEMENT', 'Title')[0].text}\n")
+
+
+class ArcGISProject:
+
+    # Opening a project by path gives back the same in-memory project every time,
+    # the way ArcGISProject("CURRENT") keeps handing back the open project in Pro
+    def __new__(cls, aprx_path):
+        return projects[aprx_path]
+
+    @classmethod
+    def create(cls, aprx_path, layers):
+        project = object.__new__(cls)
+        project.filePath = aprx_path
+        project.maps = [Map("Main Map", layers)]
+        project.layouts = [Layout("Layout", project.maps[0])]
+        projects[aprx_path] = project
+        return project
+
+    def listMaps(self, wildcard=None):
+        return [m for m in self.maps if wildcard in (None, m.name)]
+
+    def listLayouts(self, wildcard=None):
+        return [lo for lo in self.layouts if wildcard in (None, lo.name)]
+
+    def saveACopy(self, file_name):
+        layers = [Layer(ml.name, ml.dataSource) for ml in self.maps[0].layers]
+        ArcGISProject.create(file_name, layers)
+
+    def save(self):
+        pass
+
+
+mp = types.SimpleNamespace(ArcGISProject=ArcGISProject)
+
+
+############################################################
+# SYNTHETIC DATA
+############################################################
+
+# Build a synthetic national dataset and a "CURRENT" project that shows it.
+# Counties are a rows x columns grid of 50 km cells (56 x 57 = 3,192 counties by default),
+# with FIPS codes handed out state by state. "US Counties Water" is the full cells;
+# "US Counties" (water removed) trims some of them back along a "shoreline" so that,
+# like counties across a Great Lake, they touch in the water layer but sit more than
+# 5 miles apart on land. "Tribal Lands" are rectangles of various sizes scattered around,
+# a few of them in two parts sharing one AIANNH code.
+def load_synthetic_dataset(rows=56, columns=57, tribal_count=600, seed=2024):
+
+    datasets.clear()
+    projects.clear()
+    named_layers.clear()
+
+    random = np.random.default_rng(seed)
+    cell = 50000.0
+
+    row_index, column_index = np.divmod(np.arange(rows * columns), columns)
+    water_boxes = np.column_stack([
+        column_index * cell, row_index * cell, (column_index + 1) * cell, (row_index + 1) * cell,
+    ])
+
+    # FIPS: state = every 100 counties, county codes odd numbers like the real ones
+    county_number = np.arange(rows * columns)
+    fips = [f"{n // 100 + 1:02d}{(n % 100) * 2 + 1:03d}" for n in county_number]
+    states = [f"State {n // 100 + 1}" for n in county_number]
+    names = [f"County {n}" for n in county_number]
+
+    # Land boxes: trim about 1 in 12 counties back 10-15 km from one side
+    land_boxes = water_boxes.copy()
+    shoreline = random.random(len(land_boxes)) < 1 / 12
+    side = random.integers(0, 4, len(land_boxes))
+    trim = random.uniform(10000, 15000, len(land_boxes))
+    for s, direction in enumerate([1, 1, -1, -1]):
+        chosen = shoreline & (side == s)
+        land_boxes[chosen, s] += direction * trim[chosen]
+
+    county_fields = [("FIPS_C", "String"), ("NAME", "String"), ("STATE_NAME", "String"), ("CLASS", "String")]
+
+    datasets["standin.gdb/US_Counties_Water"] = Dataset(county_fields, {
+        "FIPS_C": fips, "NAME": names, "STATE_NAME": states, "CLASS": ["Not Selected"] * len(fips),
+    }, water_boxes)
+
+    datasets["standin.gdb/US_Counties"] = Dataset(county_fields, {
+        "FIPS_C": fips, "NAME": names, "STATE_NAME": states, "CLASS": ["Not Selected"] * len(fips),
+    }, land_boxes)
+
+    # Tribal areas: 5-60 km rectangles anywhere on the grid
+    width = random.uniform(5000, 60000, tribal_count)
+    height = random.uniform(5000, 60000, tribal_count)
+    x = random.uniform(0, columns * cell - width)
+    y = random.uniform(0, rows * cell - height)
+    tribal_boxes = np.column_stack([x, y, x + width, y + height])
+
+    # Every 25th area is the second part of the one before it
+    codes = []
+    for n in range(tribal_count):
+        codes.append(codes[-1] if n % 25 == 24 else f"{len(set(codes)) + 1:04d}")
+
+    tribal_fields = [("AIANNH", "String"), ("NAME", "String"), ("CLASS", "String")]
+
+    datasets["standin.gdb/Tribal_Lands"] = Dataset(tribal_fields, {
+        "AIANNH": codes, "NAME": [f"Tribal Area {c}" for c in codes], "CLASS": ["Not Selected"] * tribal_count,
+    }, tribal_boxes)
+
+    ArcGISProject.create("CURRENT", [
+        Layer("US Counties", "standin.gdb/US_Counties"),
+        Layer("Tribal Lands", "standin.gdb/Tribal_Lands"),
+        Layer("US Counties Water", "standin.gdb/US_Counties_Water"),
+    ])
+
+    return datasets
+
+
+############################################################
+
+# Put this module in place of arcpy, so "import arcpy" in the map script finds it
+def install():
+
+    sys.modules["arcpy"] = sys.modules[__name__]
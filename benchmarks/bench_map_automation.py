@@ -0,0 +1,288 @@
+
+############################################################
+# MAP AUTOMATION BENCHMARK
+############################################################
+
+# Times ArcGIS_Pro_Notebook_Map_Automation.py end to end (do_the_work) against the
+# arcpy stand-in in arcpy_standin.py and a synthetic 3,192 county / 600 tribal area dataset,
+# so it runs anywhere, no ArcGIS Pro license needed.
+# Input workbooks are generated fresh for every run, from one small sheet up to
+# multi-workbook, multi-sheet batches, tribal runs, and mixed tribal + county runs.
+
+# For every fixture it reports:
+#   - get_fips time, cold (no cache) and warm (cached)
+#   - average time per map for each step, from the "Map timing" lines
+#     the map script prints through print_message
+#   - total time and maps/hour, and which step dominates
+# Stand-in timings are NOT real ArcGIS Pro timings (nothing gets rendered and the
+# spatial stuff is done on bounding boxes); compare runs against each other, not against Pro.
+
+# Usage (from the repository folder):
+#   python benchmarks/bench_map_automation.py
+#   python benchmarks/bench_map_automation.py --fixtures small,tribal --json results.json
+#   python benchmarks/bench_map_automation.py --baseline results.json
+# With --baseline, exits with an error if any fixture's maps/hour dropped
+# by more than --tolerance (default 25%) compared to the saved results.
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import openpyxl
+
+benchmark_folder = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, benchmark_folder)
+sys.path.insert(0, os.path.dirname(benchmark_folder))
+
+import arcpy_standin
+
+arcpy_standin.install()
+
+import ArcGIS_Pro_Notebook_Map_Automation as automation
+
+
+############################################################
+# FIXTURES
+############################################################
+
+# Each fixture is a list of workbooks: (file name, {sheet name: number of counties}).
+# A sheet named "Tribal" gets tribal codes (that many tribal areas) instead of FIPS.
+fixtures = {
+    "small": [
+        ("Small_Disaster.xlsx", {"Sheet1": 8}),
+    ],
+    "multi_sheet": [
+        ("Multi_Sheet_Disaster.xlsx", {f"Drought_Week_{n}": 40 for n in range(1, 7)}),
+    ],
+    "large": [
+        (f"Large_Batch_{w}.xlsx", {f"Region_{n}": 150 for n in range(1, 6)}) for w in range(1, 4)
+    ],
+    "tribal": [
+        (f"Tribal_Designation_{w}.xlsx", {"Counties": 30, "More_Counties": 20, "Tribal": 4}) for w in range(1, 4)
+    ],
+    "mixed": [
+        ("Flooding_Disaster.xlsx", {f"Sheet_{n}": 60 for n in range(1, 5)}),
+        ("Flooding_Tribal.xlsx", {"Counties": 40, "Tribal": 3}),
+    ],
+}
+
+
+############################################################
+
+# Pick a clump of neighboring counties (disasters don't skip around the map):
+# the count counties whose centers are nearest a random spot
+def clustered_codes(boxes, codes, count, random):
+
+    centers = np.column_stack([(boxes[:, 0] + boxes[:, 2]) / 2, (boxes[:, 1] + boxes[:, 3]) / 2])
+    spot = centers[random.integers(len(centers))]
+    nearest = np.argsort(((centers - spot) ** 2).sum(axis=1), kind="stable")[:count]
+
+    return [codes[i] for i in nearest]
+
+
+# Write the fixture's workbooks into a folder: header row, then codes in the first column
+# (plus a second column of junk, like the real files have)
+def write_fixture(fixture_name, folder):
+
+    random = np.random.default_rng(len(fixture_name))
+
+    counties = arcpy_standin.datasets["standin.gdb/US_Counties_Water"]
+    tribal = arcpy_standin.datasets["standin.gdb/Tribal_Lands"]
+
+    os.makedirs(folder)
+
+    for file_name, sheets in fixtures[fixture_name]:
+
+        workbook = openpyxl.Workbook()
+        workbook.remove(workbook.active)
+
+        for sheet_name, count in sheets.items():
+
+            if sheet_name == "Tribal":
+                codes = clustered_codes(tribal.boxes, tribal.columns["AIANNH"], count, random)
+            else:
+                codes = clustered_codes(counties.boxes, counties.columns["FIPS_C"], count, random)
+
+            worksheet = workbook.create_sheet(sheet_name)
+            worksheet.append(["CODE", "NOTES"])
+
+            for code in codes:
+                worksheet.append([code, "synthetic"])
+
+        workbook.save(os.path.join(folder, file_name))
+
+
+############################################################
+# RUNNING
+############################################################
+
+# Run the map script's get_fips, quietly, and time it
+def time_get_fips():
+
+    start = time.perf_counter()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        automation.get_fips()
+
+    return time.perf_counter() - start
+
+
+# Pick the JSON back out of the timing lines the map script printed
+def parse_timing(output, label):
+
+    prefix = f"{label}: "
+
+    return [
+        json.loads(line.strip()[len(prefix):])
+        for line in output.splitlines()
+        if line.strip().startswith(prefix)
+    ]
+
+
+# Run one fixture from scratch: fresh synthetic data, fresh workbooks,
+# then get_fips cold and warm, then the whole do_the_work
+def run_fixture(fixture_name, work_folder):
+
+    arcpy_standin.load_synthetic_dataset()
+
+    folder = os.path.join(work_folder, fixture_name)
+    write_fixture(fixture_name, folder)
+
+    automation.input_folder = folder
+    automation.incremental = False
+    automation.parallel_workers = 1
+    automation.carto_cache_folder = folder
+
+    # Fresh synthetic data comes with a fresh "CURRENT" project
+    automation.open_project = None
+
+    get_fips_cold = time_get_fips()
+    get_fips_warm = time_get_fips()
+
+    output = io.StringIO()
+    start = time.perf_counter()
+
+    with contextlib.redirect_stdout(output):
+        automation.do_the_work()
+
+    total = time.perf_counter() - start
+
+    map_timings = parse_timing(output.getvalue(), "Map timing")
+    run_timings = parse_timing(output.getvalue(), "Run timing")
+
+    return {
+        "fixture": fixture_name,
+        "maps": len(map_timings),
+        "total": total,
+        "maps_per_hour": len(map_timings) / total * 3600 if total else 0.0,
+        "get_fips": {"cold": get_fips_cold, "warm": get_fips_warm},
+        "write_tables": sum(rt["write_tables"] for rt in run_timings),
+        "map_timings": map_timings,
+    }
+
+
+############################################################
+# REPORTING
+############################################################
+
+# Average seconds per map for every step
+def stage_means(result):
+
+    totals = {}
+
+    for map_timing in result["map_timings"]:
+        for stage, seconds in map_timing["stages"].items():
+            totals[stage] = totals.get(stage, 0.0) + seconds
+
+    return {stage: seconds / max(result["maps"], 1) for stage, seconds in totals.items()}
+
+
+def print_result(result):
+
+    print(f"\n{result['fixture']}: {result['maps']} maps in {result['total']:.2f} s "
+          f"({result['maps_per_hour']:,.0f} maps/hour)")
+    print(f"  get_fips: {result['get_fips']['cold'] * 1000:.1f} ms cold, "
+          f"{result['get_fips']['warm'] * 1000:.1f} ms warm")
+
+    means = stage_means(result)
+    per_map = sum(means.values()) or 1.0
+
+    print(f"  {'step':<20}{'ms/map':>10}{'share':>9}")
+
+    for stage, seconds in sorted(means.items(), key=lambda sm: -sm[1]):
+        print(f"  {stage:<20}{seconds * 1000:>10.1f}{seconds / per_map:>9.0%}")
+
+    print(f"  {'write_tables (run)':<20}{result['write_tables'] * 1000:>10.1f}")
+
+    if means:
+        print(f"  Slowest step: {max(means, key=means.get)}")
+
+
+# Compare maps/hour against saved results; send back a list of complaints
+def compare_to_baseline(results, baseline_path, tolerance):
+
+    with open(baseline_path) as baseline_file:
+        baseline = {r["fixture"]: r for r in json.load(baseline_file)}
+
+    slowdowns = []
+
+    for result in results:
+
+        before = baseline.get(result["fixture"])
+
+        if not before:
+            continue
+
+        if result["maps_per_hour"] < before["maps_per_hour"] * (1 - tolerance):
+            slowdowns.append(
+                f"{result['fixture']}: {result['maps_per_hour']:,.0f} maps/hour, "
+                f"was {before['maps_per_hour']:,.0f}"
+            )
+
+    return slowdowns
+
+
+############################################################
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--fixtures", default=",".join(fixtures),
+                        help=f"comma-separated fixtures to run (default: all of {', '.join(fixtures)})")
+    parser.add_argument("--json", help="save the results (including every map's timing) to this file")
+    parser.add_argument("--baseline", help="results file from an earlier run to check for slowdowns")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed drop in maps/hour against the baseline (default 0.25)")
+    args = parser.parse_args()
+
+    results = []
+
+    with tempfile.TemporaryDirectory() as work_folder:
+        for fixture_name in args.fixtures.split(","):
+            result = run_fixture(fixture_name.strip(), work_folder)
+            print_result(result)
+            results.append(result)
+
+    if args.json:
+        with open(args.json, "w") as json_file:
+            json.dump(results, json_file, indent=2)
+
+    if args.baseline:
+
+        slowdowns = compare_to_baseline(results, args.baseline, args.tolerance)
+
+        for slowdown in slowdowns:
+            print(f"SLOWER: {slowdown}")
+
+        if slowdowns:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+from EOC_VTEC import event_key, event_years, parse_vtec, plan_event_edits
+
+########## ########## ########## ########## ########## ##########
+
+# # Helpers
+
+# Stand-in for an arcgis Feature (what layer.query().features gives back)
+class Feature:
+
+    def __init__(self, attributes):
+        self.attributes = attributes
+
+    @property
+    def as_dict(self):
+        return {"attributes": dict(self.attributes)}
+
+
+def product(uid, vtec, updated, **attributes):
+
+    return {"attributes": dict({"Uid": uid, "Summary": vtec, "Updated": updated}, **attributes)}
+
+
+# Minimal historical layer: applies planned adds/updates the way edit_features would
+class HistLayer:
+
+    def __init__(self, rows=()):
+        self.rows = [dict(r) for r in rows]
+
+    def features(self):
+        return [Feature(dict(r)) for r in self.rows]
+
+    def apply(self, adds, updates):
+
+        for feature in adds.values():
+            self.rows.append(dict(feature["attributes"], OBJECTID=len(self.rows) + 1))
+
+        for feature in updates.values():
+            row = next(r for r in self.rows if r["OBJECTID"] == feature["attributes"]["OBJECTID"])
+            row.update(feature["attributes"])
+
+
+def run(layer, features, **kwargs):
+
+    adds, updates = plan_event_edits(features, layer.features(), "Uid", "OBJECTID", **kwargs)
+    layer.apply(adds, updates)
+
+    return adds, updates
+
+
+NEW_DEC31 = "/O.NEW.KBOU.TO.W.0001.241231T2330Z-250101T0030Z/"
+CON_DEC31 = "/O.CON.KBOU.TO.W.0001.000000T0000Z-250101T0030Z/"
+NEW_2025 = "/O.NEW.KBOU.TO.W.0001.250301T2100Z-250301T2145Z/"
+
+########## ########## ########## ########## ########## ##########
+
+# # parse_vtec
+
+def test_parse_vtec_pulls_out_event_identity():
+
+    assert parse_vtec({"vtec": "/O.CON.KBOU.TO.W.0012.000000T0000Z-240512T2145Z/"}) == [
+        "KBOU", "TO", "W", "0012", "000000T0000Z", "240512T2145Z",
+    ]
+
+
+def test_parse_vtec_checks_fields_in_order():
+
+    attributes = {
+        "summary": "/O.NEW.KBOU.SV.W.0003.240601T2000Z-240601T2030Z/",
+        "link": "/O.NEW.KBOU.TO.W.0004.240601T2000Z-240601T2030Z/",
+    }
+
+    assert parse_vtec(attributes)[1] == "SV"
+
+
+def test_parse_vtec_none_without_vtec_string():
+
+    assert parse_vtec({"summary": "Tornado Warning for Boulder County", "link": None}) is None
+
+########## ########## ########## ########## ########## ##########
+
+# # event_years
+
+def test_event_years_from_begin_time():
+
+    assert event_years(parse_vtec({"vtec": NEW_DEC31})) == ["2024"]
+
+
+def test_event_years_follow_up_ending_in_january_could_be_last_year():
+
+    assert event_years(parse_vtec({"vtec": CON_DEC31})) == ["2025", "2024"]
+
+
+def test_event_years_follow_up_outside_january():
+
+    assert event_years(parse_vtec({"vtec": "/O.CON.KBOU.TO.W.0012.000000T0000Z-240512T2145Z/"})) == ["2024"]
+
+
+def test_event_years_no_times_at_all():
+
+    assert event_years(parse_vtec({"vtec": "/O.CAN.KBOU.TO.W.0012.000000T0000Z-000000T0000Z/"})) == [""]
+
+########## ########## ########## ########## ########## ##########
+
+# # event_key
+
+def test_event_key_follow_up_goes_with_known_year():
+
+    follow_up = product("b", CON_DEC31, 2)
+
+    assert event_key(follow_up, "Uid") == "KBOU.TO.W.0001.2025"
+    assert event_key(follow_up, "Uid", {"KBOU.TO.W.0001.2024"}) == "KBOU.TO.W.0001.2024"
+
+
+def test_event_key_zone_based_products_stay_on_uid():
+
+    hurricane = product("h", "/O.NEW.KMFL.HU.W.1009.240908T1500Z-000000T0000Z/", 1)
+
+    assert event_key(hurricane, "Uid") == "h"
+
+########## ########## ########## ########## ########## ##########
+
+# # plan_event_edits
+
+def test_plan_adds_new_event_with_event_key():
+
+    adds, updates = run(HistLayer(), [product("a", NEW_DEC31, 1)])
+
+    assert list(adds) == ["KBOU.TO.W.0001.2024"]
+    assert adds["KBOU.TO.W.0001.2024"]["attributes"]["Event_Key"] == "KBOU.TO.W.0001.2024"
+    assert updates == {}
+
+
+def test_plan_newest_product_wins_within_batch():
+
+    adds, updates = run(HistLayer(), [product("b", CON_DEC31, 2), product("a", NEW_DEC31, 1)])
+
+    assert [f["attributes"]["Uid"] for f in adds.values()] == ["b"]
+    assert list(adds) == ["KBOU.TO.W.0001.2024"]
+
+
+def test_plan_same_product_again_does_nothing():
+
+    layer = HistLayer()
+    run(layer, [product("a", NEW_DEC31, 1)])
+
+    assert run(layer, [product("a", NEW_DEC31, 1)]) == ({}, {})
+
+
+def test_plan_year_boundary_event_stays_on_issue_year():
+
+    layer = HistLayer()
+
+    run(layer, [product("a", NEW_DEC31, 1)])
+    run(layer, [product("b", CON_DEC31, 2)])
+    adds, updates = run(layer, [product("c", CON_DEC31, 3)])
+
+    # Third run: the row now holds a follow-up, but keeps the year it was issued in
+    assert adds == {}
+    assert list(updates) == ["KBOU.TO.W.0001.2024"]
+    assert layer.rows == [dict(product("c", CON_DEC31, 3)["attributes"], Event_Key="KBOU.TO.W.0001.2024", OBJECTID=1)]
+
+    # A real ETN 0001 from the next year is its own event, not an update of last year's
+    adds, updates = run(layer, [product("d", NEW_2025, 4)])
+
+    assert list(adds) == ["KBOU.TO.W.0001.2025"]
+    assert updates == {}
+    assert [r["Uid"] for r in layer.rows] == ["c", "d"]
+
+
+def test_plan_legacy_row_without_event_key_falls_back_to_vtec():
+
+    layer = HistLayer([dict(product("a", NEW_DEC31, 1)["attributes"], OBJECTID=1)])
+    adds, updates = run(layer, [product("b", CON_DEC31, 2)])
+
+    assert adds == {}
+    assert updates["KBOU.TO.W.0001.2024"]["attributes"]["Event_Key"] == "KBOU.TO.W.0001.2024"
+    assert updates["KBOU.TO.W.0001.2024"]["attributes"]["OBJECTID"] == 1
+
+
+def test_plan_site_composite_key_and_lowercase_fields():
+
+    layer = HistLayer()
+    features = [
+        {"attributes": {"uid": "a", "vtec": NEW_DEC31, "updated": 1, "site_id": "S1"}},
+        {"attributes": {"uid": "a", "vtec": NEW_DEC31, "updated": 1, "site_id": "S2"}},
+    ]
+
+    adds, updates = plan_event_edits(
+        features, layer.features(), "uid", "OBJECTID", site_field="site_id", key_field="event_key",
+    )
+
+    assert sorted(adds) == ["S1|KBOU.TO.W.0001.2024", "S2|KBOU.TO.W.0001.2024"]
+    assert {f["attributes"]["event_key"] for f in adds.values()} == {"KBOU.TO.W.0001.2024"}
+
+
+def test_plan_prints_uid_fallback_count(capsys):
+
+    run(HistLayer(), [product("a", NEW_DEC31, 1), product("x", "No VTEC here", 1)])
+
+    assert "1 of 2 features have no VTEC string" in capsys.readouterr().out